@@ -119,14 +119,14 @@ class BulkPaymentProcessor:
         for payment in payments:
             validation = validate_csv_row(payment)
             
-            if validation['valid']:
+            if validation.valid:
                 valid_payments.append(payment)
                 try:
                     total_amount += Decimal(payment['amount'])
                 except:
                     pass
             else:
-                payment['_validation_errors'] = validation['errors']
+                payment['_validation_errors'] = validation.errors
                 invalid_payments.append(payment)
         
         return {
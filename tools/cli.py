@@ -85,7 +85,7 @@ def account_command(args):
             return
         
         print(f"Getting account information for {args.address}")
-        result = manager.get_account_info(args.address)
+        result = manager.get_account_info(args.address, full=True)
         
         if result['successful']:
             print(format_account_info(result['account_data']))
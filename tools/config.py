@@ -56,6 +56,10 @@ class Config:
         self.BATCH_SIZE = int(os.getenv('BATCH_SIZE', '100'))
         self.RATE_LIMIT_DELAY = float(os.getenv('RATE_LIMIT_DELAY', '0.5'))  # seconds
         
+        # Client-side Horizon throttle (StellarManager)
+        self.STELLAR_RATE_LIMIT_MIN_TIME = float(os.getenv('STELLAR_RATE_LIMIT_MIN_TIME', '0.05'))  # seconds
+        self.STELLAR_RATE_LIMIT_MAX_CONCURRENT = int(os.getenv('STELLAR_RATE_LIMIT_MAX_CONCURRENT', '10'))
+        
         # Validation Settings
         self.STRICT_VALIDATION = os.getenv('STRICT_VALIDATION', 'true').lower() == 'true'
         self.ALLOW_TESTNET_IN_PRODUCTION = os.getenv('ALLOW_TESTNET_IN_PRODUCTION', 'false').lower() == 'true'
@@ -237,6 +241,8 @@ TIMEOUT=30
 # Batch Processing
 BATCH_SIZE=100
 RATE_LIMIT_DELAY=0.5
+STELLAR_RATE_LIMIT_MIN_TIME=0.05
+STELLAR_RATE_LIMIT_MAX_CONCURRENT=10
 
 # Validation
 STRICT_VALIDATION=true
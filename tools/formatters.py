@@ -4,7 +4,7 @@ Formats data for console output, reports, and web display
 """
 
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 from datetime import datetime, timezone
 from decimal import Decimal
 
@@ -261,19 +261,22 @@ def format_balance_report(balances: List[Dict[str, Any]]) -> str:
     
     return "\n".join(lines)
 
-def format_transparency_report(data: Dict[str, Any]) -> str:
-    """Format transparency report for monthly publication
+def iter_transparency_report(data: Dict[str, Any]) -> Iterator[str]:
+    """Yield the transparency report HTML section by section
+    
+    Lets callers write the report straight to a file with writelines()
+    instead of assembling it into one string first.
     
     Args:
         data: Report data with transactions, balances, etc.
         
-    Returns:
-        Formatted HTML report
+    Yields:
+        Consecutive chunks of the HTML report
     """
     # Generate timestamp
     timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
     
-    html = f"""
+    yield f"""
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -345,7 +348,7 @@ def format_transparency_report(data: Dict[str, Any]) -> str:
     
     # Add top holders if available
     if data.get('top_holders'):
-        html += """
+        yield """
     <div class="section">
         <h2>Top Token Holders</h2>
         <table>
@@ -361,7 +364,7 @@ def format_transparency_report(data: Dict[str, Any]) -> str:
             balance = format_stellar_amount(str(holder.get('balance', 0)))
             percentage = holder.get('percentage', 0)
             
-            html += f"""
+            yield f"""
             <tr>
                 <td>{i+1}</td>
                 <td>{address[:8]}...{address[-8:]}</td>
@@ -370,11 +373,11 @@ def format_transparency_report(data: Dict[str, Any]) -> str:
             </tr>
 """
         
-        html += "        </table>\n    </div>\n"
+        yield "        </table>\n    </div>\n"
     
     # Add recent transactions if available
     if data.get('recent_transactions'):
-        html += """
+        yield """
     <div class="section">
         <h2>Recent Large Transactions</h2>
         <table>
@@ -393,7 +396,7 @@ def format_transparency_report(data: Dict[str, Any]) -> str:
             amount = format_stellar_amount(str(tx.get('amount', 0)))
             tx_hash = tx.get('hash', 'Unknown')
             
-            html += f"""
+            yield f"""
             <tr>
                 <td>{date[:10]}</td>
                 <td>{from_addr[:8]}...{from_addr[-6:]}</td>
@@ -403,9 +406,9 @@ def format_transparency_report(data: Dict[str, Any]) -> str:
             </tr>
 """
         
-        html += "        </table>\n    </div>\n"
+        yield "        </table>\n    </div>\n"
     
-    html += f"""
+    yield f"""
     <div class="footer">
         <p>This report is automatically generated from the Stellar blockchain. All data is publicly verifiable.</p>
         <p>OGC Token Issuer: {data.get('issuer_address', 'Unknown')}</p>
@@ -414,8 +417,17 @@ def format_transparency_report(data: Dict[str, Any]) -> str:
 </body>
 </html>
 """
+
+def format_transparency_report(data: Dict[str, Any]) -> str:
+    """Format transparency report for monthly publication
     
-    return html
+    Args:
+        data: Report data with transactions, balances, etc.
+        
+    Returns:
+        Formatted HTML report
+    """
+    return "".join(iter_transparency_report(data))
 
 def format_json_report(data: Dict[str, Any], indent: int = 2) -> str:
     """Format data as pretty JSON for API responses
@@ -3,6 +3,7 @@
 Generate valid Stellar test accounts that we can use for testing airdrops
 """
 
+import os
 from stellar_sdk import Keypair
 import requests
 import json
@@ -12,9 +13,12 @@ def generate_test_accounts(count=10):
     """Generate new Stellar keypairs for testing."""
     print(f"🔑 Generating {count} test Stellar accounts...")
     
+    # One os.urandom read supplies every 32-byte seed
+    seeds = os.urandom(32 * count)
+    keypairs = [Keypair.from_raw_ed25519_seed(seeds[i * 32:(i + 1) * 32]) for i in range(count)]
+    
     accounts = []
-    for i in range(count):
-        keypair = Keypair.random()
+    for i, keypair in enumerate(keypairs):
         accounts.append({
             'public_key': keypair.public_key,
             'secret_key': keypair.secret,
@@ -12,6 +12,7 @@ from typing import Any
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_POLICY_PATH = PROJECT_ROOT / "data" / "impact-policy.json"
 STELLAR_QUANTUM = Decimal("0.0000001")
+STROOPS_PER_UNIT = 10_000_000
 
 
 class ImpactPolicyError(ValueError):
@@ -80,6 +81,26 @@ def amount_text(amount: Decimal) -> str:
     return format(amount.quantize(STELLAR_QUANTUM).normalize(), "f")
 
 
+def to_stroops(value: str, label: str = "amount") -> int:
+    """Parse a Stellar amount string into integer stroops without Decimal."""
+    text = str(value).strip()
+    sign = -1 if text.startswith("-") else 1
+    whole, _, frac = text.lstrip("+-").partition(".")
+    if not (whole or frac) or not (whole or "0").isdigit() or (frac and not frac.isdigit()):
+        raise ImpactPolicyError(f"{label} must be a decimal amount")
+    if len(frac) > 7:
+        raise ImpactPolicyError(f"{label} cannot have more than 7 decimal places")
+    return sign * (int(whole or "0") * STROOPS_PER_UNIT + int(frac.ljust(7, "0")))
+
+
+def stroops_text(stroops: int) -> str:
+    sign = "-" if stroops < 0 else ""
+    whole, frac = divmod(abs(stroops), STROOPS_PER_UNIT)
+    if not frac:
+        return f"{sign}{whole}"
+    return f"{sign}{whole}.{frac:07d}".rstrip("0")
+
+
 def calculate_split(gross_value: str, policy: dict[str, Any]) -> dict[str, str]:
     gross = parse_stellar_amount(gross_value, "gross amount")
     routing = policy["routing"]
@@ -20,11 +20,20 @@ except ImportError:
     STELLAR_SDK_AVAILABLE = False
     print("Warning: stellar-sdk not installed. Install with: pip install stellar-sdk")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from config import Config as OGCConfig
-from impact_policy import calculate_split, load_policy
+from impact_policy import calculate_split, load_policy, stroops_text, to_stroops
 
 IMPACT_TREASURY = "GDMAMIC6SBYCF4NUQ6RBTUIFB5WWWS3TTDHXNCOUOLDFEPK5XOOU525F"
 
+# Balance strings Horizon (or get_fund_balance) reports for an empty fund
+ZERO_BALANCES = (None, "0", "0.0000000")
+
 
 class OpenBuildFund:
     """Legacy read-only interface for the Open Source Impact Treasury."""
@@ -148,8 +157,14 @@ class OpenBuildFund:
             if 'error' in fund_info:
                 return fund_info
             
-            allocations = self.calculate_allocation_amounts(fund_info['ogc_balance'])
-            
+            # An empty fund has nothing to allocate; skip the Decimal math.
+            if fund_info.get('ogc_balance') in ZERO_BALANCES:
+                allocations = {category: "0" for category in self.ALLOCATION}
+                allocations['unallocated'] = "0"
+                allocations['total'] = "0"
+            else:
+                allocations = self.calculate_allocation_amounts(fund_info['ogc_balance'])
+
             # Contributions are reconciled from Horizon and reviewed manifests.
             recent_contributions = self._get_recent_contributions()
             
@@ -191,11 +206,14 @@ class OpenBuildFund:
         """
         try:
             fund_info = self.get_fund_balance()
-            available_balance = Decimal(fund_info['ogc_balance'])
+            # Sum in integer stroops; format back to strings only for output
+            available_stroops = to_stroops(fund_info['ogc_balance'], 'available balance')
+            total_requested_stroops = sum(to_stroops(p['amount']) for p in proposals)
             
-            total_requested = sum(Decimal(p['amount']) for p in proposals)
+            available_balance = stroops_text(available_stroops)
+            total_requested = stroops_text(total_requested_stroops)
             
-            if total_requested > available_balance:
+            if total_requested_stroops > available_stroops:
                 return {
                     'error': f'Total requested ({total_requested}) exceeds available balance ({available_balance})'
                 }
@@ -206,8 +224,8 @@ class OpenBuildFund:
             proposal = {
                 'id': proposal_id,
                 'proposals': proposals,
-                'total_requested': str(total_requested),
-                'available_balance': str(available_balance),
+                'total_requested': total_requested,
+                'available_balance': available_balance,
                 'status': 'pending_review',
                 'created_at': datetime.now().isoformat(),
                 'review_deadline': (datetime.now() + timedelta(days=7)).isoformat()
@@ -224,6 +242,23 @@ class OpenBuildFund:
                 'error': str(e)
             }
 
+def dumps_report(report: Dict[str, Any]) -> str:
+    """Serialize a fund report as indented JSON, using orjson when installed
+    
+    Args:
+        report: Report dictionary (may contain Decimal or datetime values)
+        
+    Returns:
+        JSON string
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            report,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_SUBCLASS,
+            default=str
+        ).decode()
+    return json.dumps(report, indent=2, default=str)
+
 def calculate_transaction_with_fund_fee(amount: str, fee_rate: str = "0.05") -> Dict[str, str]:
     """Utility function to calculate transaction amounts including fund fee
     
@@ -269,4 +304,4 @@ if __name__ == "__main__":
     # Example: Generate fund report
     report = fund.generate_fund_report()
     print("\nFund Report:")
-    print(json.dumps(report, indent=2, default=str))
+    print(dumps_report(report))
@@ -7,6 +7,12 @@ Interactive setup script for configuring the Google Form integration
 import os
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 def create_config_file():
     """Create configuration file with user inputs."""
     print("🔧 OGC AIRDROP SYSTEM SETUP")
@@ -50,7 +56,10 @@ def create_config_file():
     
     # Save configuration
     with open('airdrop_config.json', 'w') as f:
-        json.dump(config, f, indent=2)
+        if ORJSON_AVAILABLE:
+            f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2).decode())
+        else:
+            json.dump(config, f, indent=2)
     
     print("\n✅ Configuration saved to airdrop_config.json")
     return config
@@ -3,24 +3,313 @@ Stellar blockchain operations for OGCoin management
 Handles account creation, payments, trustlines, and monitoring
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, List, Any, Awaitable, Callable, Optional, TypeVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import time
 
 # Import with fallback for missing dependencies
 try:
-    from stellar_sdk import Server, Keypair, TransactionBuilder, Network, Asset
-    from stellar_sdk.exceptions import SdkError
+    from stellar_sdk import Server, ServerAsync, Keypair, TransactionBuilder, Network, Asset
+    from stellar_sdk.client.requests_client import RequestsClient
+    from stellar_sdk.exceptions import SdkError, BadRequestError, BadResponseError, NotFoundError
+    from stellar_sdk.exceptions import ConnectionError as SdkConnectionError
+    from stellar_sdk.xdr import TransactionResult, TransactionResultCode
+    import requests
+    from requests.adapters import HTTPAdapter
     STELLAR_SDK_AVAILABLE = True
 except ImportError:
     STELLAR_SDK_AVAILABLE = False
     print("Warning: stellar-sdk not installed. Install with: pip install stellar-sdk")
 
+# Optional: the async Horizon client needs stellar-sdk's aiohttp extra
+try:
+    from stellar_sdk.client.aiohttp_client import AiohttpClient
+    AIOHTTP_CLIENT_AVAILABLE = True
+except ImportError:
+    AIOHTTP_CLIENT_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+
 from config import Config as OGCConfig
-from validators import validate_stellar_address, validate_amount, validate_memo
+from validators import validate_stellar_address, validate_stellar_secret, validate_amount, validate_memo
 from formatters import format_account_info, format_transaction_result
 
+logger = logging.getLogger(__name__)
+
+# Configure INFO output once at import unless the host app already set up logging
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO)
+
+# Connection pool sizing for the shared Horizon/Friendbot HTTP session
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 50
+FRIENDBOT_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+
+# Base fee changes at most once per ledger (~5s), so cache it that long
+BASE_FEE_TTL = 5.0
+
+# Submission modes: 'committed' waits for ledger inclusion, 'pool' returns
+# as soon as Horizon accepts the transaction into the queue
+SUBMIT_WAIT_MODES = ('committed', 'pool')
+
+# Minimum wait before reconnecting a dropped payment stream
+STREAM_RECONNECT_DELAY = 60.0
+
+# Stellar caps a transaction at 100 operations
+MAX_OPS_PER_TRANSACTION = 100
+
+# Horizon statuses worth retrying; every other 4xx fails fast
+RETRYABLE_STATUSES = {429, 502, 503, 504}
+
+T = TypeVar('T')
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Horizon while the circuit breaker is open"""
+    
+    def __init__(self):
+        super().__init__('circuit_open')
+
+class TransactionRejectedError(Exception):
+    """Raised when Horizon's async submission endpoint answers tx_status ERROR"""
+    
+    def __init__(self, response: Dict[str, Any]):
+        self.hash = response.get('hash')
+        self.error_result_xdr = response.get('error_result_xdr')
+        super().__init__(f"Transaction {self.hash} rejected: {self.error_result_xdr}")
+
+class CircuitBreaker:
+    """Fail fast while Horizon is down instead of burning the full retry budget
+    
+    Closed: requests flow normally. After failure_threshold consecutive
+    transient failures the breaker opens and rejects requests for
+    reset_timeout seconds. It then goes half-open and lets a single probe
+    through; the probe's outcome closes or re-opens the breaker.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """Initialize breaker
+        
+        Args:
+            failure_threshold: Consecutive transient failures before opening
+            reset_timeout: Seconds to stay open before allowing a probe
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Return True if a request may be sent now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+    
+    def record_success(self) -> None:
+        """Close the breaker after Horizon answered"""
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+    
+    def record_failure(self) -> None:
+        """Count a transient failure, opening the breaker at the threshold"""
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+    
+    def release_probe(self) -> None:
+        """Re-open after a half-open probe ended without a Horizon answer
+        
+        Closed-state failure counts are left alone, so errors that say
+        nothing about Horizon's health cannot open the breaker.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+class StellarRateLimiter:
+    """Client-side token bucket that keeps outbound Horizon traffic under its limits
+    
+    Requests are paced to one every min_time seconds on average (bursts of up
+    to `burst` are allowed after idle periods) and at most max_concurrent may
+    be in flight at once. Pacing below Horizon's limit is cheaper than
+    tripping a 429 and backing off.
+    """
+    
+    def __init__(self, min_time: float = 0.05, max_concurrent: int = 10, burst: int = 20):
+        """Initialize limiter
+        
+        Args:
+            min_time: Average seconds between request starts
+            max_concurrent: Maximum requests in flight
+            burst: Maximum tokens accumulated while idle
+        """
+        self.min_time = min_time
+        self.max_concurrent = max_concurrent
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(max_concurrent)
+    
+    def _try_take_token(self) -> float:
+        """Consume a token if one is available
+        
+        Returns:
+            0 if a token was taken, otherwise seconds until one will be
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.min_time > 0:
+                refill = (now - self._updated) / self.min_time
+                self._tokens = min(float(self.burst), self._tokens + refill)
+            else:
+                self._tokens = float(self.burst)
+            self._updated = now
+            
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) * self.min_time
+    
+    @contextmanager
+    def acquire(self):
+        """Hold a concurrency slot and a rate token for the duration of one request"""
+        self._slots.acquire()
+        try:
+            wait = self._try_take_token()
+            while wait:
+                time.sleep(wait)
+                wait = self._try_take_token()
+            yield
+        finally:
+            self._slots.release()
+    
+    @asynccontextmanager
+    async def acquire_async(self):
+        """acquire() for coroutines, waiting with asyncio.sleep instead of blocking"""
+        while not self._slots.acquire(blocking=False):
+            await asyncio.sleep(max(self.min_time, 0.01))
+        try:
+            wait = self._try_take_token()
+            while wait:
+                await asyncio.sleep(wait)
+                wait = self._try_take_token()
+            yield
+        finally:
+            self._slots.release()
+
+def _retry_after_seconds(headers) -> Optional[float]:
+    """Parse a Retry-After header given as seconds or as an HTTP-date"""
+    value = headers.get('Retry-After') if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def _loads(content: bytes) -> Any:
+    """Decode a JSON response body, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def _is_bad_sequence(error: Exception) -> bool:
+    """True if Horizon rejected a transaction for a stale sequence number
+    
+    Synchronous submissions report result_codes in the error extras; the
+    async endpoint only returns the core result as error_result_xdr.
+    """
+    extras = getattr(error, 'extras', None) or {}
+    if extras.get('result_codes', {}).get('transaction') == 'tx_bad_seq':
+        return True
+    
+    result_xdr = getattr(error, 'error_result_xdr', None)
+    if result_xdr is None:
+        try:
+            result_xdr = getattr(error, 'response').json().get('error_result_xdr')
+        except Exception:
+            return False
+    if not result_xdr:
+        return False
+    try:
+        return TransactionResult.from_xdr(result_xdr).result.code == TransactionResultCode.txBAD_SEQ
+    except Exception:
+        return False
+
+# Fields kept from a Horizon transaction record unless full=True is requested
+TRANSACTION_FIELDS = ('hash', 'ledger', 'created_at', 'successful', 'fee_charged', 'memo', 'source_account')
+
+# Fields kept from each Horizon balance entry; the asset is identified by
+# type and issuer (or pool id), not by its code alone
+BALANCE_FIELDS = ('asset_type', 'asset_code', 'asset_issuer', 'liquidity_pool_id', 'balance')
+
+def _project_balance(b: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the identifying fields of a Horizon balance entry plus a display label"""
+    if b['asset_type'] == 'native':
+        label = 'XLM'
+    elif b['asset_type'] == 'liquidity_pool_shares':
+        label = 'pool shares'
+    else:
+        label = b.get('asset_code')
+    projected = {field: b[field] for field in BALANCE_FIELDS if field in b}
+    projected['asset'] = label
+    return projected
+
+def _project_account(a: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a Horizon account record to the fields callers actually use"""
+    return {
+        'account_id': a.get('account_id'),
+        'sequence': a['sequence'],
+        'balances': [_project_balance(b) for b in a['balances']],
+        'thresholds': a['thresholds'],
+        'flags': a['flags']
+    }
+
+def _project_transaction(t: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop envelope/result XDR and links from a Horizon transaction record"""
+    return {field: t.get(field) for field in TRANSACTION_FIELDS}
+
 class StellarManager:
     """Main class for managing Stellar operations for OGC token"""
     
@@ -33,11 +322,52 @@ class StellarManager:
             raise ImportError("stellar-sdk is required. Install with: pip install stellar-sdk")
         
         self.config = config
-        self.server = Server(self.config.get_horizon_url())
         
-        # Setup logging
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(__name__)
+        # One pooled keep-alive session for Horizon and Friendbot, so repeated
+        # calls reuse TCP+TLS connections instead of handshaking every time
+        self._http = requests.Session()
+        self._http.mount('https://', HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=0
+        ))
+        self.server = Server(
+            self.config.get_horizon_url(),
+            client=RequestsClient(session=self._http)
+        )
+        
+        # Pace every Horizon request below the server-side rate limit
+        self._limiter = StellarRateLimiter(
+            min_time=float(self.config.get('stellar_rate_limit_min_time', 0.05)),
+            max_concurrent=int(self.config.get('stellar_rate_limit_max_concurrent', 10))
+        )
+        
+        # Stop calling Horizon for a while after repeated transient failures
+        self._breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+        
+        # Loaded source accounts keyed by public key. TransactionBuilder.build()
+        # advances the cached sequence, so repeat sends skip load_account.
+        # Assumes this process is the only submitter for these accounts.
+        # Sends hold the source's lock from build through submission, since
+        # the Account object itself is not thread-safe.
+        self._account_cache: Dict[str, Any] = {}
+        self._account_cache_lock = threading.Lock()
+        self._source_locks: Dict[str, threading.Lock] = {}
+        
+        # Newest payment paging_token seen per monitored account
+        self._last_cursor: Dict[str, str] = {}
+        
+        # Async Horizon client, created lazily inside the caller's event loop,
+        # and the locks serializing async sends per source account
+        self._aserver = None
+        self._async_source_locks: Dict[str, asyncio.Lock] = {}
+        
+        # (fetched_at monotonic timestamp, fee in stroops)
+        self._base_fee = (0.0, 0)
+        
+        self._network_passphrase = self.config.get_network_passphrase()
+        
+        self.logger = logger
         
         self.logger.info(f"Connected to Stellar Horizon at {self.server.horizon_url}")
         
@@ -59,6 +389,226 @@ class StellarManager:
         
         self.logger.info(f"Initialized StellarManager for {self.config.get('network', 'testnet')} network")
     
+    def _with_retry(self, fn: Callable[[], T], *, max_attempts: int = 5,
+                    base: float = 0.5, cap: float = 30) -> T:
+        """Call a Horizon request, retrying rate limits and transient failures
+        
+        Each attempt is paced by the client-side rate limiter and gated by the
+        circuit breaker, which raises CircuitOpenError while Horizon is
+        considered down. Retries 429/502/503/504 responses and connection errors with capped
+        exponential backoff plus jitter, honoring Retry-After on 429. Other
+        errors are raised immediately; other 5xx responses still count as
+        breaker failures, while 4xx responses show Horizon is healthy.
+        
+        Args:
+            fn: Zero-argument callable performing the Horizon request
+            max_attempts: Total attempts before the last error is raised
+            base: Initial backoff in seconds
+            cap: Maximum backoff in seconds
+            
+        Returns:
+            Whatever fn returns
+        """
+        for attempt in range(max_attempts):
+            if not self._breaker.allow():
+                raise CircuitOpenError()
+            try:
+                with self._limiter.acquire():
+                    result = fn()
+                self._breaker.record_success()
+                return result
+            except BaseException as e:
+                delay = self._retry_delay(e, attempt, max_attempts, base, cap)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+    
+    async def _with_retry_async(self, fn: Callable[[], Awaitable[T]], *, max_attempts: int = 5,
+                                base: float = 0.5, cap: float = 30) -> T:
+        """_with_retry for coroutines; waits without blocking the event loop
+        
+        Shares the rate limiter and circuit breaker with the synchronous calls.
+        
+        Args:
+            fn: Zero-argument callable returning the Horizon request coroutine
+            max_attempts: Total attempts before the last error is raised
+            base: Initial backoff in seconds
+            cap: Maximum backoff in seconds
+            
+        Returns:
+            Whatever the coroutine returns
+        """
+        for attempt in range(max_attempts):
+            if not self._breaker.allow():
+                raise CircuitOpenError()
+            try:
+                async with self._limiter.acquire_async():
+                    result = await fn()
+                self._breaker.record_success()
+                return result
+            except BaseException as e:
+                delay = self._retry_delay(e, attempt, max_attempts, base, cap)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+    
+    def _retry_delay(self, error: BaseException, attempt: int, max_attempts: int,
+                     base: float, cap: float) -> Optional[float]:
+        """Record a failed attempt with the breaker and pick the wait before the next
+        
+        Returns:
+            Seconds to wait before retrying, or None if error should be raised
+        """
+        if isinstance(error, (BadRequestError, BadResponseError)):
+            status = getattr(error, 'status', None)
+            if status not in RETRYABLE_STATUSES:
+                if status is not None and status >= 500:
+                    self._breaker.record_failure()
+                else:
+                    # Horizon answered; the request itself was bad
+                    self._breaker.record_success()
+                return None
+            self._breaker.record_failure()
+            if attempt == max_attempts - 1:
+                return None
+            delay = None
+            if status == 429:
+                delay = _retry_after_seconds(getattr(getattr(error, 'response', None), 'headers', None))
+            reason = f"HTTP {status}"
+        elif isinstance(error, SdkConnectionError):
+            self._breaker.record_failure()
+            if attempt == max_attempts - 1:
+                return None
+            delay = None
+            reason = str(error) or 'connection error'
+        else:
+            # Not a Horizon failure, but a half-open probe must still be
+            # released or the breaker would stay stuck
+            self._breaker.release_probe()
+            return None
+        
+        if delay is None:
+            delay = min(cap, base * 2 ** attempt) + random.uniform(0, base)
+        self.logger.warning(
+            f"Horizon request failed ({reason}); retry {attempt + 1}/{max_attempts - 1} in {delay:.1f}s"
+        )
+        return delay
+    
+    def _base_fee_cached(self, ttl: float = BASE_FEE_TTL) -> int:
+        """Return the network base fee, refetching from Horizon only after ttl seconds
+        
+        Args:
+            ttl: Maximum age of the cached fee in seconds
+            
+        Returns:
+            Base fee in stroops
+        """
+        fetched_at, fee = self._base_fee
+        now = time.monotonic()
+        if fee and now - fetched_at < ttl:
+            return fee
+        
+        fee = self._with_retry(self.server.fetch_base_fee)
+        self._base_fee = (now, fee)
+        return fee
+    
+    def _tx_builder(self, source_account, base_fee: Optional[int] = None):
+        """Start a TransactionBuilder with the cached passphrase and base fee
+        
+        Args:
+            source_account: Source Account (its sequence advances on build)
+            base_fee: Fee per operation in stroops; defaults to the cached network fee
+            
+        Returns:
+            TransactionBuilder
+        """
+        return TransactionBuilder(
+            source_account=source_account,
+            network_passphrase=self._network_passphrase,
+            base_fee=self._base_fee_cached() if base_fee is None else base_fee
+        )
+    
+    def _get_account(self, public_key: str):
+        """Return the cached source Account, loading it from Horizon on first use"""
+        with self._account_cache_lock:
+            account = self._account_cache.get(public_key)
+        if account is None:
+            account = self._with_retry(lambda: self.server.load_account(public_key))
+            with self._account_cache_lock:
+                self._account_cache[public_key] = account
+        return account
+    
+    def _source_lock(self, public_key: str) -> threading.Lock:
+        """Return the lock serializing sends from one source account"""
+        with self._account_cache_lock:
+            return self._source_locks.setdefault(public_key, threading.Lock())
+    
+    def _invalidate_account(self, public_key: str) -> None:
+        """Drop a cached Account whose sequence may no longer match the ledger"""
+        with self._account_cache_lock:
+            self._account_cache.pop(public_key, None)
+    
+    def _submit(self, transaction, wait: str = 'committed') -> Dict[str, Any]:
+        """Submit a signed transaction in the requested wait mode
+        
+        Args:
+            transaction: Signed TransactionEnvelope
+            wait: 'committed' to block until the ledger closes, 'pool' to
+                return once Horizon has queued it (poll get_transaction_status)
+            
+        Returns:
+            Horizon response; pool-mode responses carry 'hash' and 'tx_status'
+            
+        Raises:
+            TransactionRejectedError: pool mode and Stellar Core rejected it
+        """
+        if wait == 'pool':
+            response = self._with_retry(lambda: self.server.submit_async_transaction(transaction))
+            if response.get('tx_status') == 'ERROR':
+                raise TransactionRejectedError(response)
+            return response
+        return self._with_retry(lambda: self.server.submit_transaction(transaction))
+    
+    def get_transaction_status(self, tx_hash: str, max_polls: int = 10,
+                               interval: float = 1.0, cap: float = 10.0) -> Dict[str, Any]:
+        """Poll Horizon for a transaction submitted with wait='pool'
+        
+        Args:
+            tx_hash: Transaction hash returned at submission
+            max_polls: Number of lookups before reporting PENDING
+            interval: Initial delay between lookups in seconds (doubles each poll)
+            cap: Maximum delay between lookups in seconds
+            
+        Returns:
+            Status result: SUCCESS, FAILED or PENDING
+        """
+        try:
+            for poll in range(max_polls):
+                try:
+                    record = self._with_retry(
+                        lambda: self.server.transactions().transaction(tx_hash).call()
+                    )
+                    return {
+                        'successful': True,
+                        'hash': tx_hash,
+                        'status': 'SUCCESS' if record.get('successful') else 'FAILED',
+                        'ledger': record.get('ledger'),
+                        'fee_charged': record.get('fee_charged', 'Unknown')
+                    }
+                except NotFoundError:
+                    if poll < max_polls - 1:
+                        time.sleep(min(cap, interval * 2 ** poll))
+            
+            return {'successful': True, 'hash': tx_hash, 'status': 'PENDING'}
+            
+        except Exception as e:
+            self.logger.error(f"Failed to get status for transaction {tx_hash}: {e}")
+            return {
+                'successful': False,
+                'error': str(e),
+                'hash': tx_hash
+            }
+    
     def create_account(self) -> Dict[str, Any]:
         """Create a new Stellar account pair
         
@@ -85,6 +635,35 @@ class StellarManager:
                 'error': str(e)
             }
     
+    def create_accounts(self, count: int) -> Dict[str, Any]:
+        """Create many Stellar account pairs from a single OS entropy read
+        
+        Args:
+            count: Number of keypairs to generate
+            
+        Returns:
+            Dictionary with a list of public/secret key pairs
+        """
+        try:
+            keypairs = random_keypairs(count)
+            
+            self.logger.info(f"Created {len(keypairs)} new accounts")
+            return {
+                'successful': True,
+                'accounts': [
+                    {'public_key': keypair.public_key, 'secret_key': keypair.secret}
+                    for keypair in keypairs
+                ],
+                'created_at': datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Failed to create accounts: {e}")
+            return {
+                'successful': False,
+                'error': str(e)
+            }
+    
     def fund_account_testnet(self, account_id: str) -> Dict[str, Any]:
         """Fund an account on testnet using Friendbot
         
@@ -108,16 +687,16 @@ class StellarManager:
                     'error': 'Account funding only available on testnet'
                 }
             
-            import requests
-            # Use Friendbot directly via HTTP request
+            # Use Friendbot directly via the pooled HTTP session
             friendbot_url = f"https://friendbot.stellar.org?addr={account_id}"
-            response = requests.get(friendbot_url)
+            response = self._http.get(friendbot_url, timeout=FRIENDBOT_TIMEOUT)
             response.raise_for_status()
+            body = _loads(response.content)
             
             self.logger.info(f"Funded testnet account: {account_id}")
             return {
                 'successful': True,
-                'transaction_hash': response.json().get('hash') if response.status_code == 200 else 'N/A',
+                'transaction_hash': body.get('hash', 'N/A'),
                 'account_id': account_id
             }
             
@@ -128,11 +707,12 @@ class StellarManager:
                 'error': str(e)
             }
     
-    def get_account_info(self, account_id: str) -> Dict[str, Any]:
+    def get_account_info(self, account_id: str, full: bool = False) -> Dict[str, Any]:
         """Get account information from Stellar
         
         Args:
             account_id: Account public key
+            full: Return the raw Horizon record instead of the projected fields
             
         Returns:
             Account information or error
@@ -144,12 +724,12 @@ class StellarManager:
             }
         
         try:
-            account = self.server.accounts().account_id(account_id).call()
+            account = self._with_retry(lambda: self.server.accounts().account_id(account_id).call())
             
             self.logger.info(f"Retrieved account info for: {account_id}")
             return {
                 'successful': True,
-                'account_data': account,
+                'account_data': account if full else _project_account(account),
                 'account_id': account_id
             }
             
@@ -160,16 +740,24 @@ class StellarManager:
                 'error': str(e)
             }
     
-    def create_trustline(self, account_secret: str, limit: Optional[str] = None) -> Dict[str, Any]:
+    def create_trustline(self, account_secret: str, limit: Optional[str] = None,
+                         wait: str = 'committed') -> Dict[str, Any]:
         """Create trustline for OGC token
         
         Args:
             account_secret: Account secret key
             limit: Optional trust limit
+            wait: 'committed' (default) or 'pool' to return once queued
             
         Returns:
             Transaction result
         """
+        if wait not in SUBMIT_WAIT_MODES:
+            return {'successful': False, 'error': f'Invalid wait mode: {wait}'}
+        
+        if not validate_stellar_secret(account_secret):
+            return {'successful': False, 'error': 'Invalid secret'}
+        
         if not self.ogc_asset:
             return {
                 'successful': False,
@@ -178,30 +766,29 @@ class StellarManager:
         
         try:
             account_keypair = Keypair.from_secret(account_secret)
-            account = self.server.load_account(account_keypair.public_key)
+            account = self._with_retry(lambda: self.server.load_account(account_keypair.public_key))
             
             # Build transaction
             transaction = (
-                TransactionBuilder(
-                    source_account=account,
-                    network_passphrase=self.config.get_network_passphrase(),
-                    base_fee=self.server.fetch_base_fee()
-                )
+                self._tx_builder(account)
                 .add_change_trust_op(asset=self.ogc_asset, limit=limit)
                 .set_timeout(30)
                 .build()
             )
             
             transaction.sign(account_keypair)
-            response = self.server.submit_transaction(transaction)
+            response = self._submit(transaction, wait)
             
             self.logger.info(f"Created trustline for {account_keypair.public_key}")
-            return {
+            result = {
                 'successful': True,
                 'hash': response['hash'],
                 'account_id': account_keypair.public_key,
                 'asset_code': self.config.get('token_code', 'OGC')
             }
+            if wait == 'pool':
+                result['status'] = response.get('tx_status', 'PENDING')
+            return result
             
         except Exception as e:
             self.logger.error(f"Failed to create trustline: {e}")
@@ -219,6 +806,9 @@ class StellarManager:
         Returns:
             Transaction result
         """
+        if not validate_stellar_secret(account_secret):
+            return {'successful': False, 'error': 'Invalid secret'}
+        
         if not self.ogc_asset:
             return {
                 'successful': False,
@@ -227,22 +817,18 @@ class StellarManager:
         
         try:
             account_keypair = Keypair.from_secret(account_secret)
-            account = self.server.load_account(account_keypair.public_key)
+            account = self._with_retry(lambda: self.server.load_account(account_keypair.public_key))
             
             # Build transaction to remove trust (limit = "0")
             transaction = (
-                TransactionBuilder(
-                    source_account=account,
-                    network_passphrase=self.config.get_network_passphrase(),
-                    base_fee=self.server.fetch_base_fee()
-                )
+                self._tx_builder(account)
                 .add_change_trust_op(asset=self.ogc_asset, limit="0")
                 .set_timeout(30)
                 .build()
             )
             
             transaction.sign(account_keypair)
-            response = self.server.submit_transaction(transaction)
+            response = self._with_retry(lambda: self.server.submit_transaction(transaction))
             
             self.logger.info(f"Removed trustline for {account_keypair.public_key}")
             return {
@@ -259,8 +845,46 @@ class StellarManager:
                 'error': str(e)
             }
     
+    def _validate_payment(self, destination: str, amount: str,
+                          memo: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Check payment inputs locally, returning an error result or None if valid"""
+        if not validate_stellar_address(destination):
+            return {'successful': False, 'error': 'Invalid destination address'}
+        
+        if not validate_amount(amount):
+            return {'successful': False, 'error': 'Invalid amount'}
+        
+        if memo and not validate_memo(memo):
+            return {'successful': False, 'error': 'Invalid memo'}
+        
+        if not self.ogc_asset:
+            return {
+                'successful': False,
+                'error': 'OGC asset not configured - issuer secret required'
+            }
+        
+        return None
+    
+    def _build_payment_transaction(self, source_account, base_fee: int, destination: str,
+                                   amount: str, memo: Optional[str] = None):
+        """Build an unsigned single-payment OGC transaction"""
+        transaction_builder = self._tx_builder(source_account, base_fee)
+        
+        # Add memo if provided
+        if memo:
+            transaction_builder.add_text_memo(memo)
+        
+        # Add payment operation
+        transaction_builder.add_payment_op(
+            destination=destination,
+            asset=self.ogc_asset,
+            amount=amount
+        )
+        
+        return transaction_builder.set_timeout(30).build()
+    
     def send_payment(self, source_secret: str, destination: str, amount: str, 
-                    memo: Optional[str] = None) -> Dict[str, Any]:
+                    memo: Optional[str] = None, wait: str = 'committed') -> Dict[str, Any]:
         """Send OGC payment
         
         Args:
@@ -268,58 +892,259 @@ class StellarManager:
             destination: Destination account public key
             amount: Payment amount
             memo: Optional memo
+            wait: 'committed' (default) blocks until the ledger closes; 'pool'
+                returns with status PENDING once Horizon queues the transaction
             
         Returns:
             Transaction result
         """
-        # Validate inputs
-        if not validate_stellar_address(destination):
-            return {'successful': False, 'error': 'Invalid destination address'}
+        if wait not in SUBMIT_WAIT_MODES:
+            return {'successful': False, 'error': f'Invalid wait mode: {wait}'}
         
-        if not validate_amount(amount):
-            return {'successful': False, 'error': 'Invalid amount'}
+        if not validate_stellar_secret(source_secret):
+            return {'successful': False, 'error': 'Invalid secret'}
         
-        if memo and not validate_memo(memo):
-            return {'successful': False, 'error': 'Invalid memo'}
+        validation_error = self._validate_payment(destination, amount, memo)
+        if validation_error:
+            return validation_error
         
-        if not self.ogc_asset:
+        source_public = 'Unknown'
+        try:
+            source_keypair = Keypair.from_secret(source_secret)
+            source_public = source_keypair.public_key
+            
+            with self._source_lock(source_public):
+                for attempt in range(2):
+                    source_account = self._get_account(source_public)
+                    transaction = self._build_payment_transaction(
+                        source_account, self._base_fee_cached(), destination, amount, memo
+                    )
+                    transaction.sign(source_keypair)
+                    
+                    try:
+                        response = self._submit(transaction, wait)
+                        break
+                    except Exception as e:
+                        # The locally advanced sequence may not have been consumed
+                        self._invalidate_account(source_public)
+                        if attempt == 0 and _is_bad_sequence(e):
+                            self.logger.warning("Sequence out of date; reloading source account")
+                            continue
+                        raise
+            
+            self.logger.info(f"Sent {amount} OGC from {source_public} to {destination}")
+            result = {
+                'successful': True,
+                'hash': response['hash'],
+                'from': source_public,
+                'to': destination,
+                'amount': amount,
+                'asset_code': self.config.get('token_code', 'OGC'),
+                'memo': memo,
+                'fee_charged': response.get('fee_charged', 'Unknown')
+            }
+            if wait == 'pool':
+                result['status'] = response.get('tx_status', 'PENDING')
+            return result
+            
+        except Exception as e:
+            self.logger.error(f"Payment failed: {e}")
             return {
                 'successful': False,
-                'error': 'OGC asset not configured - issuer secret required'
+                'error': str(e),
+                'from': source_public,
+                'to': destination,
+                'amount': amount
             }
+    
+    def send_payments_bulk(self, source_secret: str, payments: List[Dict[str, str]],
+                           memo: Optional[str] = None) -> Dict[str, Any]:
+        """Send many OGC payments packed into multi-operation transactions
+        
+        Payments are grouped up to 100 per transaction, so N payments cost
+        ceil(N/100) fees, signatures and Horizon round trips instead of N.
+        The source account is loaded once; it is reloaded only when Horizon
+        reports tx_bad_seq, in which case the chunk is resubmitted once.
+        
+        Args:
+            source_secret: Source account secret key
+            payments: List of dicts with 'to' and 'amount' keys
+            memo: Optional text memo applied to every transaction
+            
+        Returns:
+            Summary with per-payment results in input order
+        """
+        if not validate_stellar_secret(source_secret):
+            return {'successful': False, 'error': 'Invalid secret'}
+        
+        if memo and not validate_memo(memo):
+            return {'successful': False, 'error': 'Invalid memo'}
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(payments)
+        pending = []
+        for index, payment in enumerate(payments):
+            destination = payment.get('to', '')
+            amount = payment.get('amount', '')
+            validation_error = self._validate_payment(destination, amount, None)
+            if validation_error:
+                results[index] = dict(validation_error, index=index, to=destination, amount=amount)
+            else:
+                pending.append((index, destination, amount))
         
+        transaction_hashes = []
         try:
             source_keypair = Keypair.from_secret(source_secret)
-            source_account = self.server.load_account(source_keypair.public_key)
-            
-            # Build transaction
-            transaction_builder = TransactionBuilder(
-                source_account=source_account,
-                network_passphrase=self.config.get_network_passphrase(),
-                base_fee=self.server.fetch_base_fee()
-            )
-            
-            # Add memo if provided
-            if memo:
-                transaction_builder.add_text_memo(memo)
+        except Exception as e:
+            self.logger.error(f"Bulk payment failed: {e}")
+            return {'successful': False, 'error': str(e)}
+        
+        # Hold the source account for the whole run; build() advances its sequence
+        with self._source_lock(source_keypair.public_key):
+            try:
+                source_account = self._get_account(source_keypair.public_key) if pending else None
+            except Exception as e:
+                self.logger.error(f"Bulk payment failed: {e}")
+                return {'successful': False, 'error': str(e)}
             
-            # Add payment operation
-            transaction_builder.add_payment_op(
-                destination=destination,
-                asset=self.ogc_asset,
-                amount=amount
-            )
+            for start in range(0, len(pending), MAX_OPS_PER_TRANSACTION):
+                chunk = pending[start:start + MAX_OPS_PER_TRANSACTION]
+                
+                for reload_attempt in range(2):
+                    try:
+                        transaction_builder = self._tx_builder(source_account)
+                        if memo:
+                            transaction_builder.add_text_memo(memo)
+                        for _, destination, amount in chunk:
+                            transaction_builder.add_payment_op(
+                                destination=destination,
+                                asset=self.ogc_asset,
+                                amount=amount
+                            )
+                        transaction = transaction_builder.set_timeout(30).build()
+                        transaction.sign(source_keypair)
+                        
+                        response = self._with_retry(lambda: self.server.submit_transaction(transaction))
+                        transaction_hashes.append(response['hash'])
+                        for index, destination, amount in chunk:
+                            results[index] = {
+                                'index': index,
+                                'successful': True,
+                                'hash': response['hash'],
+                                'to': destination,
+                                'amount': amount
+                            }
+                        break
+                    
+                    except Exception as e:
+                        self._invalidate_account(source_keypair.public_key)
+                        if _is_bad_sequence(e) and reload_attempt == 0:
+                            self.logger.warning("Sequence out of date; reloading source account")
+                            try:
+                                source_account = self._get_account(source_keypair.public_key)
+                                continue
+                            except Exception as reload_error:
+                                e = reload_error
+                        
+                        self.logger.error(f"Bulk payment chunk failed: {e}")
+                        for index, destination, amount in chunk:
+                            results[index] = {
+                                'index': index,
+                                'successful': False,
+                                'error': str(e),
+                                'to': destination,
+                                'amount': amount
+                            }
+                        break
+        
+        successful_count = sum(1 for r in results if r['successful'])
+        self.logger.info(
+            f"Bulk payment: {successful_count}/{len(payments)} payments in {len(transaction_hashes)} transactions"
+        )
+        return {
+            'successful': successful_count == len(payments),
+            'from': source_keypair.public_key,
+            'results': results,
+            'transactions': transaction_hashes,
+            'successful_count': successful_count,
+            'failed_count': len(payments) - successful_count
+        }
+    
+    def _get_async_server(self):
+        """Return the shared ServerAsync, creating it on first use
+        
+        The underlying aiohttp session is bound to the running event loop, so
+        async methods should be driven from a single loop; call close_async()
+        before that loop exits.
+        """
+        if self._aserver is None:
+            if not AIOHTTP_CLIENT_AVAILABLE:
+                raise ImportError("Async payments need aiohttp. Install with: pip install 'stellar-sdk[aiohttp]'")
+            self._aserver = ServerAsync(self.config.get_horizon_url(), client=AiohttpClient())
+        return self._aserver
+    
+    async def close_async(self) -> None:
+        """Close the shared ServerAsync session, if one was opened"""
+        if self._aserver is not None:
+            await self._aserver.close()
+            self._aserver = None
+    
+    async def send_payment_async(self, source_secret: str, destination: str, amount: str,
+                                 memo: Optional[str] = None) -> Dict[str, Any]:
+        """Send OGC payment without blocking the event loop
+        
+        Loads the source account and fetches the base fee concurrently (or uses
+        the cached fee), so submission costs one fewer Horizon round trip than
+        send_payment. Requests share the rate limiter, circuit breaker and
+        retries of the synchronous calls. Sends from one source account are
+        serialized so each uses a fresh sequence number; gathering sends from
+        many sources runs them concurrently.
+        
+        Args:
+            source_secret: Source account secret key
+            destination: Destination account public key
+            amount: Payment amount
+            memo: Optional memo
             
-            transaction = transaction_builder.set_timeout(30).build()
-            transaction.sign(source_keypair)
+        Returns:
+            Transaction result, same shape as send_payment
+        """
+        if not validate_stellar_secret(source_secret):
+            return {'successful': False, 'error': 'Invalid secret'}
+        
+        validation_error = self._validate_payment(destination, amount, memo)
+        if validation_error:
+            return validation_error
+        
+        source_public = 'Unknown'
+        try:
+            source_keypair = Keypair.from_secret(source_secret)
+            source_public = source_keypair.public_key
+            server = self._get_async_server()
             
-            response = self.server.submit_transaction(transaction)
+            async with self._async_source_locks.setdefault(source_public, asyncio.Lock()):
+                load_account = self._with_retry_async(lambda: server.load_account(source_public))
+                fetched_at, base_fee = self._base_fee
+                if base_fee and time.monotonic() - fetched_at < BASE_FEE_TTL:
+                    source_account = await load_account
+                else:
+                    source_account, base_fee = await asyncio.gather(
+                        load_account,
+                        self._with_retry_async(server.fetch_base_fee)
+                    )
+                    self._base_fee = (time.monotonic(), base_fee)
+                
+                transaction = self._build_payment_transaction(
+                    source_account, base_fee, destination, amount, memo
+                )
+                transaction.sign(source_keypair)
+                
+                response = await self._with_retry_async(lambda: server.submit_transaction(transaction))
             
-            self.logger.info(f"Sent {amount} OGC from {source_keypair.public_key} to {destination}")
+            self.logger.info(f"Sent {amount} OGC from {source_public} to {destination}")
             return {
                 'successful': True,
                 'hash': response['hash'],
-                'from': source_keypair.public_key,
+                'from': source_public,
                 'to': destination,
                 'amount': amount,
                 'asset_code': self.config.get('token_code', 'OGC'),
@@ -332,17 +1157,19 @@ class StellarManager:
             return {
                 'successful': False,
                 'error': str(e),
-                'from': Keypair.from_secret(source_secret).public_key if source_secret else 'Unknown',
+                'from': source_public,
                 'to': destination,
                 'amount': amount
             }
     
-    def get_account_transactions(self, account_id: str, limit: int = 50) -> Dict[str, Any]:
+    def get_account_transactions(self, account_id: str, limit: int = 50,
+                                 full: bool = False) -> Dict[str, Any]:
         """Get recent transactions for an account
         
         Args:
             account_id: Account public key
             limit: Number of transactions to fetch
+            full: Keep the raw records, including envelope/result XDR
             
         Returns:
             List of transactions
@@ -354,15 +1181,17 @@ class StellarManager:
             }
         
         try:
-            response = (
+            response = self._with_retry(
                 self.server.transactions()
                 .for_account(account_id)
                 .limit(limit)
                 .order(desc=True)
-                .call()
+                .call
             )
             
             transactions = response.get('_embedded', {}).get('records', [])
+            if not full:
+                transactions = [_project_transaction(t) for t in transactions]
             
             self.logger.info(f"Retrieved {len(transactions)} transactions for {account_id}")
             return {
@@ -380,12 +1209,25 @@ class StellarManager:
                 'account_id': account_id
             }
     
+    def _is_ogc_payment(self, payment: Dict[str, Any]) -> bool:
+        """True if a Horizon payment record moves OGC (from the configured issuer, when known)"""
+        if payment.get('type') != 'payment':
+            return False
+        if payment.get('asset_code') != self.config.get('token_code', 'OGC'):
+            return False
+        return self.ogc_asset is None or payment.get('asset_issuer') == self.ogc_asset.issuer
+    
     def monitor_payments(self, account_id: str, callback_func=None) -> Dict[str, Any]:
-        """Monitor payments for an account (basic implementation)
+        """Poll for OGC payments received since the previous call
+        
+        The first call for an account returns the 20 most recent payments and
+        remembers the newest paging token; later calls page forward from that
+        cursor, so each poll downloads only payments not seen before. Horizon
+        cannot filter account payments by asset, so OGC is selected locally.
         
         Args:
             account_id: Account to monitor
-            callback_func: Optional callback for new payments
+            callback_func: Optional callback invoked with each new OGC payment
             
         Returns:
             Monitoring result
@@ -397,30 +1239,43 @@ class StellarManager:
             }
         
         try:
-            # Get recent payments
-            payments_response = (
-                self.server.payments()
-                .for_account(account_id)
-                .limit(20)
-                .order(desc=True)
-                .call()
-            )
+            cursor = self._last_cursor.get(account_id)
+            if cursor:
+                builder = (
+                    self.server.payments()
+                    .for_account(account_id)
+                    .cursor(cursor)
+                    .limit(200)
+                    .order(desc=False)
+                )
+            else:
+                builder = (
+                    self.server.payments()
+                    .for_account(account_id)
+                    .limit(20)
+                    .order(desc=True)
+                )
             
+            payments_response = self._with_retry(builder.call)
             payments = payments_response.get('_embedded', {}).get('records', [])
             
-            # Filter for OGC payments
-            ogc_payments = []
-            for payment in payments:
-                if (payment.get('type') == 'payment' and 
-                    payment.get('asset_code') == self.config.get('token_code', 'OGC')):
-                    ogc_payments.append(payment)
+            if payments:
+                newest = payments[-1] if cursor else payments[0]
+                self._last_cursor[account_id] = newest['paging_token']
+            
+            ogc_payments = [payment for payment in payments if self._is_ogc_payment(payment)]
             
-            self.logger.info(f"Found {len(ogc_payments)} OGC payments for {account_id}")
+            if callback_func:
+                for payment in ogc_payments:
+                    callback_func(payment)
+            
+            self.logger.info(f"Found {len(ogc_payments)} new OGC payments for {account_id}")
             return {
                 'successful': True,
                 'account_id': account_id,
                 'ogc_payments': ogc_payments,
-                'total_payments': len(payments)
+                'total_payments': len(payments),
+                'cursor': self._last_cursor.get(account_id)
             }
             
         except Exception as e:
@@ -431,6 +1286,86 @@ class StellarManager:
                 'account_id': account_id
             }
     
+    def monitor_payments_many(self, account_ids: List[str], callback_func=None) -> Dict[str, Dict[str, Any]]:
+        """Poll several accounts for new OGC payments concurrently
+        
+        Each account is polled with monitor_payments on a worker thread. The
+        pool is no larger than the rate limiter's concurrency, and every
+        request still takes a limiter slot, so Horizon sees the same request
+        rate as a serial loop would allow.
+        
+        Args:
+            account_ids: Accounts to monitor; repeated IDs are polled once
+            callback_func: Optional callback invoked with each new OGC payment
+            
+        Returns:
+            Monitoring result for each account, keyed by account ID
+        """
+        # One worker per account; duplicates would poll the same cursor twice
+        # and fire the callback twice for each payment
+        account_ids = list(dict.fromkeys(account_ids))
+        if not account_ids:
+            return {}
+        
+        workers = min(self._limiter.max_concurrent, len(account_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.monitor_payments, account_id, callback_func): account_id
+                for account_id in account_ids
+            }
+            return {futures[future]: future.result() for future in as_completed(futures)}
+    
+    def monitor_payments_stream(self, account_id: str, callback_func: Callable[[Dict[str, Any]], None],
+                                stop_event: threading.Event) -> threading.Thread:
+        """Push new OGC payments to a callback over a Horizon SSE stream
+        
+        Starts a daemon thread that holds a server-sent events connection to
+        Horizon, so new payments arrive about one ledger close after they
+        happen without any polling. Resumes from the cursor shared with
+        monitor_payments (or 'now'), so reconnects do not replay history.
+        On a dropped stream it waits Retry-After for a 429, otherwise at
+        least 60 seconds, before reconnecting. The stop event is checked
+        between events and during reconnect waits.
+        
+        Args:
+            account_id: Account to monitor
+            callback_func: Called with each new OGC payment record
+            stop_event: Set to stop the stream
+            
+        Returns:
+            The started streaming thread
+        """
+        if not validate_stellar_address(account_id):
+            raise ValueError('Invalid Stellar address')
+        
+        def run() -> None:
+            while not stop_event.is_set():
+                cursor = self._last_cursor.get(account_id, 'now')
+                try:
+                    stream = self.server.payments().for_account(account_id).cursor(cursor).stream()
+                    for payment in stream:
+                        if stop_event.is_set():
+                            return
+                        if 'paging_token' in payment:
+                            self._last_cursor[account_id] = payment['paging_token']
+                        if self._is_ogc_payment(payment):
+                            callback_func(payment)
+                    delay = STREAM_RECONNECT_DELAY
+                except Exception as e:
+                    delay = None
+                    if getattr(e, 'status', None) == 429:
+                        delay = _retry_after_seconds(getattr(getattr(e, 'response', None), 'headers', None))
+                    delay = max(delay or 0.0, STREAM_RECONNECT_DELAY)
+                    self.logger.warning(
+                        f"Payment stream for {account_id} dropped ({e}); reconnecting in {delay:.0f}s"
+                    )
+                stop_event.wait(delay)
+        
+        thread = threading.Thread(target=run, name=f"payments-{account_id[:8]}", daemon=True)
+        thread.start()
+        self.logger.info(f"Streaming OGC payments for {account_id}")
+        return thread
+    
     def get_network_info(self) -> Dict[str, Any]:
         """Get network information and health status
         
@@ -439,7 +1374,7 @@ class StellarManager:
         """
         try:
             # Get ledger info
-            ledger = self.server.ledgers().order(desc=True).limit(1).call()
+            ledger = self._with_retry(self.server.ledgers().order(desc=True).limit(1).call)
             latest_ledger = ledger['_embedded']['records'][0] if ledger['_embedded']['records'] else {}
             
             health_status = {
@@ -447,7 +1382,7 @@ class StellarManager:
                 'horizon_url': self.config.get_horizon_url(),
                 'latest_ledger': latest_ledger.get('sequence', 'Unknown'),
                 'ledger_time': latest_ledger.get('closed_at', 'Unknown'),
-                'base_fee': self.server.fetch_base_fee(),
+                'base_fee': self._with_retry(self.server.fetch_base_fee),
                 'ogc_configured': self.ogc_asset is not None
             }
             
@@ -496,6 +1431,18 @@ def create_new_account() -> Dict[str, Any]:
             'error': str(e)
         }
 
+def random_keypairs(count: int) -> List[Any]:
+    """Generate count random keypairs from one os.urandom call
+    
+    Args:
+        count: Number of keypairs to generate
+        
+    Returns:
+        List of Keypair objects
+    """
+    seeds = os.urandom(32 * count)
+    return [Keypair.from_raw_ed25519_seed(seeds[i * 32:(i + 1) * 32]) for i in range(count)]
+
 def validate_account_address(address: str) -> bool:
     """Validate a Stellar account address (utility function)
     
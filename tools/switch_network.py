@@ -4,51 +4,43 @@ Switch to testnet and create test accounts with trustlines
 """
 
 import os
+import re
 from config import Config
 
-def switch_to_testnet():
-    """Switch configuration to testnet for testing trustlines."""
+ENV_FILE = '.env'
+NETWORK_LINE = re.compile(r'^STELLAR_NETWORK=.*$', re.MULTILINE)
+
+def _set_network(target):
+    """Point STELLAR_NETWORK in .env at target, writing the file atomically."""
     
     # Read current .env
-    with open('.env', 'r') as f:
-        lines = f.readlines()
-    
-    # Update network to testnet
-    updated_lines = []
-    for line in lines:
-        if line.startswith('STELLAR_NETWORK='):
-            updated_lines.append('STELLAR_NETWORK=testnet\n')
-            print("🔄 Switched to testnet")
-        else:
-            updated_lines.append(line)
+    with open(ENV_FILE, 'r') as f:
+        text = f.read()
     
-    # Write updated .env
-    with open('.env', 'w') as f:
-        f.writelines(updated_lines)
+    # Update (or append) the network line in one pass
+    updated, count = NETWORK_LINE.subn(f'STELLAR_NETWORK={target}', text, count=1)
+    if count:
+        print(f"🔄 Switched to {target}")
+    else:
+        if updated and not updated.endswith('\n'):
+            updated += '\n'
+        updated += f'STELLAR_NETWORK={target}\n'
     
+    # Write to a temp file and swap it in so readers never see a torn .env
+    tmp_file = f'{ENV_FILE}.tmp'
+    with open(tmp_file, 'w') as f:
+        f.write(updated)
+    os.replace(tmp_file, ENV_FILE)
+
+def switch_to_testnet():
+    """Switch configuration to testnet for testing trustlines."""
+    _set_network('testnet')
     print("✅ Configuration updated to testnet")
     print("💡 Now you can create test accounts with trustlines!")
 
 def switch_to_mainnet():
     """Switch configuration back to mainnet."""
-    
-    # Read current .env
-    with open('.env', 'r') as f:
-        lines = f.readlines()
-    
-    # Update network to mainnet
-    updated_lines = []
-    for line in lines:
-        if line.startswith('STELLAR_NETWORK='):
-            updated_lines.append('STELLAR_NETWORK=mainnet\n')
-            print("🔄 Switched to mainnet")
-        else:
-            updated_lines.append(line)
-    
-    # Write updated .env
-    with open('.env', 'w') as f:
-        f.writelines(updated_lines)
-    
+    _set_network('mainnet')
     print("✅ Configuration updated to mainnet")
 
 if __name__ == "__main__":
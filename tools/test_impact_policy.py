@@ -6,7 +6,13 @@ from __future__ import annotations
 import unittest
 from decimal import Decimal
 
-from impact_policy import ImpactPolicyError, calculate_split, load_policy
+from impact_policy import (
+    ImpactPolicyError,
+    calculate_split,
+    load_policy,
+    stroops_text,
+    to_stroops,
+)
 
 
 class ImpactPolicyTests(unittest.TestCase):
@@ -45,6 +51,20 @@ class ImpactPolicyTests(unittest.TestCase):
         with self.assertRaises(ImpactPolicyError):
             calculate_split("0.0000001", self.policy)
 
+    def test_stroops_round_trip(self) -> None:
+        self.assertEqual(to_stroops("17.1234567"), 171234567)
+        self.assertEqual(to_stroops("1000.0000000"), 10_000_000_000)
+        self.assertEqual(to_stroops(".5"), 5_000_000)
+        self.assertEqual(stroops_text(171234567), "17.1234567")
+        self.assertEqual(stroops_text(10_000_000_000), "1000")
+        self.assertEqual(stroops_text(-5_000_000), "-0.5")
+
+    def test_to_stroops_rejects_excess_precision(self) -> None:
+        with self.assertRaises(ImpactPolicyError):
+            to_stroops("1.00000001")
+        with self.assertRaises(ImpactPolicyError):
+            to_stroops("abc")
+
 
 if __name__ == "__main__":
     unittest.main()
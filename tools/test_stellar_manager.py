@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+"""Unit tests for Horizon retries, rate limiting, circuit breaking and payments in stellar_manager."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest import mock
+
+from stellar_sdk.client.response import Response
+from stellar_sdk.exceptions import BadRequestError, BadResponseError
+from stellar_sdk.exceptions import ConnectionError as SdkConnectionError
+
+import stellar_manager
+from stellar_manager import (
+    CircuitBreaker,
+    StellarManager,
+    StellarRateLimiter,
+    _project_account,
+    _retry_after_seconds,
+)
+
+
+def horizon_error(status: int, headers: dict | None = None, body: dict | None = None) -> Exception:
+    response = Response(status, json.dumps(body or {}), headers or {}, "https://horizon.test/")
+    return (BadRequestError if status < 500 else BadResponseError)(response)
+
+
+def failing(*errors: Exception, result: str = "ok"):
+    """A fake Horizon call that raises each error in turn, then returns result."""
+    calls = []
+
+    def fn() -> str:
+        calls.append(None)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return fn, calls
+
+
+def bare_manager(breaker: CircuitBreaker | None = None) -> StellarManager:
+    """A StellarManager with only what _with_retry needs; no config or Horizon."""
+    manager = StellarManager.__new__(StellarManager)
+    manager._breaker = breaker or CircuitBreaker(failure_threshold=100)
+    manager._limiter = StellarRateLimiter(min_time=0)
+    manager.logger = stellar_manager.logger
+    return manager
+
+
+class FakeClock:
+    """Stands in for time.monotonic/time.sleep; sleeping advances the clock."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list = []
+        self._lock = threading.Lock()
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        with self._lock:
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+    def install(self, test: unittest.TestCase) -> "FakeClock":
+        for name in ("monotonic", "sleep"):
+            patcher = mock.patch.object(stellar_manager.time, name, getattr(self, name))
+            patcher.start()
+            test.addCleanup(patcher.stop)
+        return self
+
+
+class WithRetryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        sleep = mock.patch.object(stellar_manager.time, "sleep")
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+        jitter = mock.patch.object(stellar_manager.random, "uniform", return_value=0.0)
+        jitter.start()
+        self.addCleanup(jitter.stop)
+        self.manager = bare_manager()
+
+    def delays(self) -> list:
+        return [c.args[0] for c in self.sleep.call_args_list]
+
+    def test_retries_transient_failures_with_exponential_backoff(self) -> None:
+        fn, calls = failing(horizon_error(503), horizon_error(502), SdkConnectionError("reset"))
+        self.assertEqual(self.manager._with_retry(fn, base=0.5), "ok")
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(self.delays(), [0.5, 1.0, 2.0])
+
+    def test_backoff_is_capped(self) -> None:
+        fn, _ = failing(*[horizon_error(503)] * 4)
+        self.manager._with_retry(fn, base=1, cap=3)
+        self.assertEqual(self.delays(), [1, 2, 3, 3])
+
+    def test_honors_retry_after_on_429(self) -> None:
+        fn, _ = failing(horizon_error(429, {"Retry-After": "7"}))
+        self.assertEqual(self.manager._with_retry(fn), "ok")
+        self.assertEqual(self.delays(), [7.0])
+
+    def test_429_without_retry_after_uses_backoff(self) -> None:
+        fn, _ = failing(horizon_error(429))
+        self.manager._with_retry(fn, base=0.5)
+        self.assertEqual(self.delays(), [0.5])
+
+    def test_gives_up_after_max_attempts(self) -> None:
+        fn, calls = failing(*[horizon_error(503)] * 5)
+        with self.assertRaises(BadResponseError):
+            self.manager._with_retry(fn, max_attempts=3)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(len(self.delays()), 2)
+
+    def test_client_errors_are_not_retried(self) -> None:
+        for status in (400, 401, 404):
+            fn, calls = failing(horizon_error(status))
+            with self.assertRaises(BadRequestError):
+                self.manager._with_retry(fn)
+            self.assertEqual(len(calls), 1, status)
+        self.sleep.assert_not_called()
+
+
+class RetryAfterTests(unittest.TestCase):
+    def test_delta_seconds(self) -> None:
+        self.assertEqual(_retry_after_seconds({"Retry-After": "5"}), 5.0)
+        self.assertEqual(_retry_after_seconds({"Retry-After": "1.5"}), 1.5)
+        self.assertEqual(_retry_after_seconds({"Retry-After": "-3"}), 0.0)
+
+    def test_http_date(self) -> None:
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        seconds = _retry_after_seconds({"Retry-After": format_datetime(retry_at, usegmt=True)})
+        self.assertAlmostEqual(seconds, 30, delta=2)
+
+    def test_past_http_date_is_zero(self) -> None:
+        retry_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+        self.assertEqual(_retry_after_seconds({"Retry-After": format_datetime(retry_at, usegmt=True)}), 0.0)
+
+    def test_missing_or_garbage(self) -> None:
+        self.assertIsNone(_retry_after_seconds(None))
+        self.assertIsNone(_retry_after_seconds({}))
+        self.assertIsNone(_retry_after_seconds({"Retry-After": "soon"}))
+
+
+class RateLimiterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock().install(self)
+
+    def acquire(self, limiter: StellarRateLimiter, times: int = 1) -> None:
+        for _ in range(times):
+            with limiter.acquire():
+                pass
+
+    def test_burst_is_free_then_requests_wait(self) -> None:
+        limiter = StellarRateLimiter(min_time=1.0, burst=3)
+        self.acquire(limiter, 3)
+        self.assertEqual(self.clock.sleeps, [])
+        self.acquire(limiter)
+        self.assertAlmostEqual(sum(self.clock.sleeps), 1.0)
+
+    def test_paces_to_min_time_after_burst(self) -> None:
+        limiter = StellarRateLimiter(min_time=0.5, burst=2)
+        start = self.clock.now
+        self.acquire(limiter, 2 + 10)
+        self.assertAlmostEqual(self.clock.now - start, 10 * 0.5)
+
+    def test_idle_refill_is_capped_at_burst(self) -> None:
+        limiter = StellarRateLimiter(min_time=1.0, burst=3)
+        self.acquire(limiter, 3)
+        self.clock.now += 100
+        self.acquire(limiter, 3)
+        self.assertEqual(self.clock.sleeps, [])
+        self.acquire(limiter)
+        self.assertAlmostEqual(sum(self.clock.sleeps), 1.0)
+
+    def test_concurrent_acquires_share_one_bucket(self) -> None:
+        limiter = StellarRateLimiter(min_time=1.0, burst=20)
+        threads = [threading.Thread(target=self.acquire, args=(limiter,)) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.clock.sleeps, [])
+        self.acquire(limiter)
+        self.assertAlmostEqual(sum(self.clock.sleeps), 1.0)
+
+
+class RateLimiterConcurrencyTests(unittest.TestCase):
+    def test_caps_requests_in_flight(self) -> None:
+        limiter = StellarRateLimiter(min_time=0, max_concurrent=2)
+        lock = threading.Lock()
+        in_flight = peak = 0
+
+        def request() -> None:
+            nonlocal in_flight, peak
+            with limiter.acquire():
+                with lock:
+                    in_flight += 1
+                    peak = max(peak, in_flight)
+                time.sleep(0.02)
+                with lock:
+                    in_flight -= 1
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(peak, 2)
+        self.assertEqual(in_flight, 0)
+
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock().install(self)
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+    def open_breaker(self) -> None:
+        for _ in range(3):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_failure()
+
+    def test_opens_at_failure_threshold(self) -> None:
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_success_resets_failure_count(self) -> None:
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.breaker.record_success()
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_opens_after_reset_timeout(self) -> None:
+        self.open_breaker()
+        self.clock.now += 29
+        self.assertFalse(self.breaker.allow())
+        self.clock.now += 1
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+
+    def test_lets_one_probe_through_at_a_time(self) -> None:
+        self.open_breaker()
+        self.clock.now += 30
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+    def test_probe_success_closes(self) -> None:
+        self.open_breaker()
+        self.clock.now += 30
+        self.breaker.allow()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+        self.assertTrue(self.breaker.allow())
+
+    def test_probe_failure_reopens(self) -> None:
+        self.open_breaker()
+        self.clock.now += 30
+        self.breaker.allow()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.clock.now += 30
+        self.assertTrue(self.breaker.allow())
+
+    def test_non_retryable_server_errors_open_the_breaker(self) -> None:
+        manager = bare_manager(self.breaker)
+        for _ in range(3):
+            with self.assertRaises(BadResponseError):
+                manager._with_retry(failing(horizon_error(500))[0])
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_client_errors_count_as_healthy(self) -> None:
+        manager = bare_manager(self.breaker)
+        for _ in range(2):
+            self.breaker.record_failure()
+        with self.assertRaises(BadRequestError):
+            manager._with_retry(failing(horizon_error(404))[0])
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_unexpected_errors_do_not_count_while_closed(self) -> None:
+        manager = bare_manager(self.breaker)
+
+        def bug() -> None:
+            raise KeyError("balances")
+
+        for _ in range(5):
+            with self.assertRaises(KeyError):
+                manager._with_retry(bug)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_unexpected_probe_error_releases_the_probe(self) -> None:
+        manager = bare_manager(self.breaker)
+        self.open_breaker()
+        self.clock.now += 30
+
+        def probe() -> None:
+            raise ValueError("unparseable response")
+
+        with self.assertRaises(ValueError):
+            manager._with_retry(probe)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.clock.now += 30
+        self.assertEqual(manager._with_retry(lambda: "ok"), "ok")
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+
+class AsyncRetryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        sleep = mock.patch.object(stellar_manager.asyncio, "sleep", mock.AsyncMock())
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+        jitter = mock.patch.object(stellar_manager.random, "uniform", return_value=0.0)
+        jitter.start()
+        self.addCleanup(jitter.stop)
+
+    def test_retries_like_the_sync_path(self) -> None:
+        manager = bare_manager()
+        fn, calls = failing(horizon_error(503), horizon_error(429, {"Retry-After": "4"}))
+
+        async def call() -> str:
+            return fn()
+
+        self.assertEqual(asyncio.run(manager._with_retry_async(call, base=0.5)), "ok")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual([c.args[0] for c in self.sleep.await_args_list], [0.5, 4.0])
+
+    def test_shares_the_circuit_breaker(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=2)
+        manager = bare_manager(breaker)
+        fn, _ = failing(*[horizon_error(503)] * 5)
+
+        async def call() -> str:
+            return fn()
+
+        with self.assertRaises(stellar_manager.CircuitOpenError):
+            asyncio.run(manager._with_retry_async(call))
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+
+class FakeAsyncServer:
+    """Records the order of account loads and submissions across tasks."""
+
+    def __init__(self) -> None:
+        self.events: list = []
+
+    async def load_account(self, public_key: str) -> str:
+        self.events.append(("load", public_key))
+        await asyncio.sleep(0)
+        return public_key
+
+    async def submit_transaction(self, transaction) -> dict:
+        self.events.append(("submit", transaction))
+        await asyncio.sleep(0)
+        return {"hash": "abc"}
+
+
+class SendPaymentAsyncTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = FakeAsyncServer()
+        self.manager = bare_manager()
+        self.manager.config = mock.Mock(get=lambda key, default=None: default)
+        self.manager._base_fee = (time.monotonic(), 100)
+        self.manager._async_source_locks = {}
+        self.manager._get_async_server = lambda: self.server
+        self.manager._validate_payment = lambda *args: None
+        self.manager._build_payment_transaction = lambda account, *args: mock.Mock(source=account)
+        keypair = mock.Mock(from_secret=lambda secret: mock.Mock(public_key=secret.lower()))
+        for name, value in (("Keypair", keypair), ("validate_stellar_secret", lambda secret: True)):
+            patcher = mock.patch.object(stellar_manager, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def send_all(self, *sources: str) -> list:
+        async def main() -> list:
+            return await asyncio.gather(*(
+                self.manager.send_payment_async(source, "GDEST", "1") for source in sources
+            ))
+        return asyncio.run(main())
+
+    def test_sends_from_one_source_are_serialized(self) -> None:
+        results = self.send_all("SA", "SA", "SA")
+        self.assertTrue(all(r["successful"] for r in results))
+        self.assertEqual(
+            [kind for kind, _ in self.server.events],
+            ["load", "submit"] * 3
+        )
+
+    def test_sends_from_different_sources_overlap(self) -> None:
+        results = self.send_all("SA", "SB")
+        self.assertTrue(all(r["successful"] for r in results))
+        self.assertEqual(
+            [kind for kind, _ in self.server.events[:2]],
+            ["load", "load"]
+        )
+
+
+class FakeBuilder:
+    def __init__(self, account: dict) -> None:
+        self.account = account
+        self.ops: list = []
+
+    def add_text_memo(self, memo: str) -> "FakeBuilder":
+        return self
+
+    def add_payment_op(self, destination: str, asset, amount: str) -> "FakeBuilder":
+        self.ops.append((destination, amount))
+        return self
+
+    def set_timeout(self, seconds: int) -> "FakeBuilder":
+        return self
+
+    def build(self):
+        self.account["sequence"] += 1
+        return mock.Mock(ops=self.ops, sequence=self.account["sequence"])
+
+
+class FakeServer:
+    """Horizon stand-in whose ledger sequence can move under the client."""
+
+    def __init__(self, *submit_errors: Exception) -> None:
+        self.sequence = 100
+        self.loads = 0
+        self.submitted: list = []
+        self._errors = list(submit_errors)
+
+    def load_account(self, public_key: str) -> dict:
+        self.loads += 1
+        return {"sequence": self.sequence}
+
+    def submit_transaction(self, transaction) -> dict:
+        if self._errors:
+            raise self._errors.pop(0)
+        self.submitted.append(transaction)
+        self.sequence = transaction.sequence
+        return {"hash": f"tx{len(self.submitted)}"}
+
+
+class SendPaymentsBulkTests(unittest.TestCase):
+    BAD_SEQ = {"extras": {"result_codes": {"transaction": "tx_bad_seq"}}}
+
+    def setUp(self) -> None:
+        self.manager = bare_manager()
+        self.manager.ogc_asset = None
+        self.manager._account_cache = {}
+        self.manager._account_cache_lock = threading.Lock()
+        self.manager._source_locks = {}
+        self.manager._tx_builder = FakeBuilder
+        self.manager._validate_payment = (
+            lambda to, amount, memo: {"successful": False, "error": "Invalid amount"} if amount == "bad" else None
+        )
+        keypair = mock.Mock(from_secret=lambda secret: mock.Mock(public_key="GSOURCE"))
+        for name, value in (("Keypair", keypair), ("validate_stellar_secret", lambda secret: True)):
+            patcher = mock.patch.object(stellar_manager, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def payments(self, count: int) -> list:
+        return [{"to": f"GDEST{i}", "amount": "1"} for i in range(count)]
+
+    def test_packs_up_to_100_payments_per_transaction(self) -> None:
+        self.manager.server = FakeServer()
+        result = self.manager.send_payments_bulk("SSOURCE", self.payments(250))
+        self.assertTrue(result["successful"])
+        self.assertEqual([len(tx.ops) for tx in self.manager.server.submitted], [100, 100, 50])
+        self.assertEqual(result["transactions"], ["tx1", "tx2", "tx3"])
+        self.assertEqual(self.manager.server.loads, 1)
+
+    def test_results_follow_input_order(self) -> None:
+        self.manager.server = FakeServer()
+        payments = self.payments(3)
+        payments[1]["amount"] = "bad"
+        result = self.manager.send_payments_bulk("SSOURCE", payments)
+        self.assertEqual([r["index"] for r in result["results"]], [0, 1, 2])
+        self.assertEqual([r["successful"] for r in result["results"]], [True, False, True])
+        self.assertEqual(self.manager.server.submitted[0].ops, [("GDEST0", "1"), ("GDEST2", "1")])
+
+    def test_reloads_and_resubmits_once_on_bad_sequence(self) -> None:
+        self.manager.server = FakeServer(horizon_error(400, body=self.BAD_SEQ))
+        result = self.manager.send_payments_bulk("SSOURCE", self.payments(2))
+        self.assertTrue(result["successful"])
+        self.assertEqual(self.manager.server.loads, 2)
+        self.assertEqual(len(self.manager.server.submitted), 1)
+
+    def test_gives_up_after_one_reload(self) -> None:
+        self.manager.server = FakeServer(*[horizon_error(400, body=self.BAD_SEQ)] * 2)
+        result = self.manager.send_payments_bulk("SSOURCE", self.payments(2))
+        self.assertFalse(result["successful"])
+        self.assertEqual(result["failed_count"], 2)
+        self.assertEqual(self.manager.server.loads, 2)
+
+    def test_other_rejections_are_not_resubmitted(self) -> None:
+        self.manager.server = FakeServer(horizon_error(400, body={"extras": {"result_codes": {"transaction": "tx_failed"}}}))
+        result = self.manager.send_payments_bulk("SSOURCE", self.payments(2))
+        self.assertFalse(result["successful"])
+        self.assertEqual(self.manager.server.loads, 1)
+        self.assertEqual(self.manager.server.submitted, [])
+
+
+class MonitorPaymentsManyTests(unittest.TestCase):
+    def test_repeated_accounts_are_polled_once(self) -> None:
+        manager = bare_manager()
+        polled = []
+        lock = threading.Lock()
+
+        def monitor(account_id: str, callback) -> dict:
+            with lock:
+                polled.append(account_id)
+            return {"account_id": account_id}
+
+        manager.monitor_payments = monitor
+        results = manager.monitor_payments_many(["GA", "GB", "GA", "GB", "GA"])
+        self.assertEqual(sorted(polled), ["GA", "GB"])
+        self.assertEqual(set(results), {"GA", "GB"})
+
+
+class ProjectAccountTests(unittest.TestCase):
+    ISSUER = "GAOGCISSUER"
+
+    def project_balances(self, *balances: dict) -> list:
+        account = {"account_id": "GA", "sequence": "1", "balances": list(balances),
+                   "thresholds": {}, "flags": {}}
+        return _project_account(account)["balances"]
+
+    def test_native_is_labelled_by_asset_type(self) -> None:
+        [native] = self.project_balances({"asset_type": "native", "balance": "10.0000000"})
+        self.assertEqual(native, {"asset_type": "native", "balance": "10.0000000", "asset": "XLM"})
+
+    def test_credit_keeps_issuer(self) -> None:
+        real, fake = self.project_balances(
+            {"asset_type": "credit_alphanum4", "asset_code": "OGC", "asset_issuer": self.ISSUER,
+             "balance": "5.0000000", "limit": "100.0000000"},
+            {"asset_type": "credit_alphanum4", "asset_code": "OGC", "asset_issuer": "GAFAKE",
+             "balance": "5.0000000"},
+        )
+        self.assertEqual(real["asset"], "OGC")
+        self.assertEqual(real["asset_issuer"], self.ISSUER)
+        self.assertNotIn("limit", real)
+        self.assertNotEqual(real, fake)
+
+    def test_pool_shares_are_not_xlm(self) -> None:
+        [shares] = self.project_balances(
+            {"asset_type": "liquidity_pool_shares", "liquidity_pool_id": "abcd", "balance": "1.0000000"}
+        )
+        self.assertEqual(shares["asset"], "pool shares")
+        self.assertEqual(shares["liquidity_pool_id"], "abcd")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Unit tests for the OGCoin input validators."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import validators
+from validators import (
+    sanitize_memo,
+    validate_amount,
+    validate_bulk_payment_file,
+    validate_memo,
+    validate_stellar_address,
+    validate_stellar_secret,
+)
+
+ADDRESS = "GDMAMIC6SBYCF4NUQ6RBTUIFB5WWWS3TTDHXNCOUOLDFEPK5XOOU525F"
+
+
+class StellarKeyValidatorTests(unittest.TestCase):
+    def test_accepts_public_key(self) -> None:
+        self.assertTrue(validate_stellar_address(ADDRESS))
+
+    def test_rejects_malformed_public_keys(self) -> None:
+        for address in ("", ADDRESS[:-1], "S" + ADDRESS[1:], ADDRESS.lower(), None):
+            self.assertFalse(validate_stellar_address(address), address)
+
+    def test_non_string_input_is_rejected_before_the_cache(self) -> None:
+        self.assertFalse(validate_stellar_address([ADDRESS]))
+        self.assertIsNone(validate_amount(["1"]))
+
+    def test_rejects_malformed_secrets(self) -> None:
+        for secret in ("", ADDRESS, "S" + "A" * 54, "s" + "A" * 55, None):
+            self.assertFalse(validate_stellar_secret(secret), secret)
+
+
+class AmountValidatorTests(unittest.TestCase):
+    def test_accepts_plain_amounts(self) -> None:
+        for amount in ("1", "0.0000001", "100.5", "922337203685.4775807", ".5", "5."):
+            self.assertTrue(validate_amount(amount), amount)
+
+    def test_rejects_malformed_amounts(self) -> None:
+        for amount in ("", ".", "0", "0.", ".0", "-1", "+1", "1e5", " 1", "1\n", "1.00000001",
+                       "922337203685.4775808", None):
+            self.assertFalse(validate_amount(amount), amount)
+
+    def test_whole_amount_bounds(self) -> None:
+        self.assertTrue(validate_amount("922337203685"))
+        self.assertFalse(validate_amount("922337203686"))
+        self.assertFalse(validate_amount("000"))
+
+
+class MemoValidatorTests(unittest.TestCase):
+    def test_hash_memo_requires_32_hex_bytes(self) -> None:
+        self.assertTrue(validate_memo("ab" * 32, "hash"))
+        self.assertTrue(validate_memo("AB" * 32, "return"))
+        for memo in ("ab" * 31, "zz" * 32, "ab " * 21 + "a"):
+            self.assertFalse(validate_memo(memo, "hash"), memo)
+
+    def test_sanitize_memo_strips_unsafe_characters(self) -> None:
+        self.assertEqual(sanitize_memo("<b>OGC #1</b> a@b.c"), "bOGC #1b a@b.c")
+        self.assertEqual(sanitize_memo("café <ok>"), "café ok")
+        self.assertEqual(sanitize_memo("x" * 40), "x" * 28)
+
+
+
+class BulkPaymentFileTests(unittest.TestCase):
+    # Row 3 has an extra field; rows after it must keep their real line numbers
+    CSV = f"address,amount,memo\n{ADDRESS},1,ok\nbad,2,x,extra\n{ADDRESS},0,\nbad,4,\n"
+
+    def setUp(self) -> None:
+        handle, self.path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w", newline="") as f:
+            f.write(self.CSV)
+        self.addCleanup(os.remove, self.path)
+
+    def assert_reports_real_rows(self) -> None:
+        result = validate_bulk_payment_file(self.path)
+        self.assertEqual(result["total_rows"], 4)
+        self.assertEqual(result["valid_rows"], 1)
+        self.assertEqual([e["row"] for e in result["row_errors"]], [3, 4, 5])
+
+    def test_malformed_row_keeps_row_numbers_with_csv(self) -> None:
+        with mock.patch.object(validators, "PYARROW_AVAILABLE", False):
+            self.assert_reports_real_rows()
+
+    @unittest.skipUnless(validators.PYARROW_AVAILABLE, "pyarrow not installed")
+    def test_malformed_row_keeps_row_numbers_with_pyarrow(self) -> None:
+        self.assert_reports_real_rows()
+
+
+if __name__ == "__main__":
+    unittest.main()
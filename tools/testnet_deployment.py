@@ -4,9 +4,109 @@ Emergency Testnet Deployment
 Deploy OGC on Stellar testnet since mainnet account is locked.
 """
 
+import asyncio
+import random
+import sys
+import time
+
 from stellar_sdk import Keypair, Server, Network
 import requests
 
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+FRIENDBOT_URL = "https://friendbot.stellar.org"
+FRIENDBOT_ATTEMPTS = 5
+FRIENDBOT_TIMEOUT = 30.0
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+class FriendbotError(Exception):
+    """Friendbot did not fund an account after all retries"""
+
+def backoff_delay(attempt):
+    """Exponential backoff capped at 30 seconds, plus up to 1 second of jitter"""
+    return min(30, 2 ** attempt) + random.random()
+
+def failure_detail(status, body):
+    """Short description of a failed Friendbot response, including its body"""
+    return f"HTTP {status}: {body[:200].strip()}"
+
+async def fund(get, network_errors, name, public_key):
+    """Request testnet XLM for one account; returns (name, public_key, 200 or error)
+    
+    get is a coroutine function taking the public key and returning
+    (status, body); network_errors are the client's connection exceptions.
+    """
+    last_error = None
+    for attempt in range(FRIENDBOT_ATTEMPTS):
+        try:
+            status, body = await get(public_key)
+        except network_errors as e:
+            last_error = e
+        else:
+            if status == 200:
+                return name, public_key, status
+            last_error = failure_detail(status, body)
+            if status not in RETRYABLE_STATUSES:
+                return name, public_key, FriendbotError(last_error)
+        await asyncio.sleep(backoff_delay(attempt))
+    return name, public_key, FriendbotError(f"gave up after {FRIENDBOT_ATTEMPTS} attempts: {last_error}")
+
+async def fund_all(accounts):
+    """Fund all accounts concurrently over one connection pool
+    
+    Prefers httpx over HTTP/2, which multiplexes every request on a single
+    TLS connection; otherwise uses aiohttp.
+    """
+    if HTTPX_AVAILABLE:
+        limits = httpx.Limits(max_connections=64, max_keepalive_connections=16)
+        async with httpx.AsyncClient(http2=True, timeout=FRIENDBOT_TIMEOUT, limits=limits) as client:
+            async def get(public_key):
+                response = await client.get(FRIENDBOT_URL, params={"addr": public_key})
+                return response.status_code, response.text
+            
+            return await asyncio.gather(*[fund(get, httpx.HTTPError, name, pk) for name, pk in accounts])
+    
+    connector = aiohttp.TCPConnector(limit_per_host=64)
+    timeout = aiohttp.ClientTimeout(total=FRIENDBOT_TIMEOUT)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        async def get(public_key):
+            async with session.get(FRIENDBOT_URL, params={"addr": public_key}) as response:
+                return response.status, await response.text()
+        
+        network_errors = (aiohttp.ClientError, asyncio.TimeoutError)
+        return await asyncio.gather(*[fund(get, network_errors, name, pk) for name, pk in accounts])
+
+def fund_sequential(name, public_key):
+    """Blocking version of fund() for when neither httpx nor aiohttp is installed"""
+    last_error = None
+    for attempt in range(FRIENDBOT_ATTEMPTS):
+        try:
+            response = requests.get(FRIENDBOT_URL, params={"addr": public_key}, timeout=FRIENDBOT_TIMEOUT)
+            if response.status_code == 200:
+                return name, public_key, response.status_code
+            last_error = failure_detail(response.status_code, response.text)
+            if response.status_code not in RETRYABLE_STATUSES:
+                return name, public_key, FriendbotError(last_error)
+        except requests.exceptions.RequestException as e:
+            last_error = e
+        time.sleep(backoff_delay(attempt))
+    return name, public_key, FriendbotError(f"gave up after {FRIENDBOT_ATTEMPTS} attempts: {last_error}")
+
+def fund_all_sequential(accounts):
+    """Fallback when neither httpx nor aiohttp is installed"""
+    return [fund_sequential(name, public_key) for name, public_key in accounts]
+
 def deploy_ogc_testnet():
     print("🚨 EMERGENCY TESTNET OGC DEPLOYMENT")
     print("=" * 40)
@@ -19,19 +119,20 @@ def deploy_ogc_testnet():
     distributor_keypair = Keypair.random()
     personal_keypair = Keypair.random()
     
+    # Format each account block once; it goes to stdout and to the file
+    account_lines = []
+    for name, keypair in (("ISSUER", issuer_keypair),
+                          ("DISTRIBUTOR", distributor_keypair),
+                          ("PERSONAL", personal_keypair)):
+        account_lines += [
+            f"{name} ACCOUNT:\n",
+            f"Public:  {keypair.public_key}\n",
+            f"Secret:  {keypair.secret}\n",
+            "\n",
+        ]
+    
     print("🔑 GENERATED TESTNET ACCOUNTS:")
-    print(f"ISSUER:")
-    print(f"   Public:  {issuer_keypair.public_key}")
-    print(f"   Secret:  {issuer_keypair.secret}")
-    print()
-    print(f"DISTRIBUTOR:")
-    print(f"   Public:  {distributor_keypair.public_key}")
-    print(f"   Secret:  {distributor_keypair.secret}")
-    print()
-    print(f"PERSONAL:")
-    print(f"   Public:  {personal_keypair.public_key}")
-    print(f"   Secret:  {personal_keypair.secret}")
-    print()
+    sys.stdout.writelines(account_lines)
     
     # Fund accounts using Stellar testnet friendbot
     accounts = [
@@ -41,40 +142,33 @@ def deploy_ogc_testnet():
     ]
     
     print("💰 FUNDING ACCOUNTS WITH TESTNET XLM:")
-    for name, public_key in accounts:
-        try:
-            response = requests.get(f"https://friendbot.stellar.org?addr={public_key}")
-            if response.status_code == 200:
-                print(f"   ✅ {name}: {public_key} funded with 10,000 testnet XLM")
-            else:
-                print(f"   ❌ Failed to fund {name}: {response.status_code}")
-        except Exception as e:
-            print(f"   ❌ Error funding {name}: {e}")
+    if HTTPX_AVAILABLE or AIOHTTP_AVAILABLE:
+        results = asyncio.run(fund_all(accounts))
+    else:
+        results = fund_all_sequential(accounts)
+    
+    for name, public_key, outcome in results:
+        if outcome == 200:
+            print(f"   ✅ {name}: {public_key} funded with 10,000 testnet XLM")
+        else:
+            print(f"   ❌ Failed to fund {name}: {outcome}")
     
     # Save testnet accounts
     with open("testnet_accounts.txt", "w") as f:
-        f.write("OGC TESTNET DEPLOYMENT ACCOUNTS\\n")
-        f.write("="*35 + "\\n\\n")
-        f.write("Network: Stellar Testnet\\n")
-        f.write("Purpose: Emergency deployment due to mainnet account lockout\\n\\n")
-        
-        f.write(f"ISSUER ACCOUNT:\\n")
-        f.write(f"Public:  {issuer_keypair.public_key}\\n")
-        f.write(f"Secret:  {issuer_keypair.secret}\\n\\n")
-        
-        f.write(f"DISTRIBUTOR ACCOUNT:\\n")
-        f.write(f"Public:  {distributor_keypair.public_key}\\n")
-        f.write(f"Secret:  {distributor_keypair.secret}\\n\\n")
-        
-        f.write(f"PERSONAL ACCOUNT:\\n")
-        f.write(f"Public:  {personal_keypair.public_key}\\n")
-        f.write(f"Secret:  {personal_keypair.secret}\\n\\n")
-        
-        f.write("NEXT STEPS:\\n")
-        f.write("1. Update config.py to use testnet\\n")
-        f.write("2. Run OGC deployment on testnet\\n")
-        f.write("3. Test all functionality\\n")
-        f.write("4. Migrate to mainnet when account access is restored\\n")
+        f.writelines([
+            "OGC TESTNET DEPLOYMENT ACCOUNTS\n",
+            "=" * 35 + "\n\n",
+            "Network: Stellar Testnet\n",
+            "Purpose: Emergency deployment due to mainnet account lockout\n\n",
+        ])
+        f.writelines(account_lines)
+        f.writelines([
+            "NEXT STEPS:\n",
+            "1. Update config.py to use testnet\n",
+            "2. Run OGC deployment on testnet\n",
+            "3. Test all functionality\n",
+            "4. Migrate to mainnet when account access is restored\n",
+        ])
     
     print("💾 Testnet accounts saved to testnet_accounts.txt")
     print()
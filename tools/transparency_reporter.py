@@ -3,10 +3,16 @@ Transparency reporting for OGCoin
 Generates monthly reports for public transparency
 """
 
-import json
+import heapq
+import os
+import random
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Callable, Optional, TypeVar
 from pathlib import Path
 from decimal import Decimal
 import logging
@@ -14,13 +20,142 @@ import logging
 # Import with fallback for missing dependencies
 try:
     from stellar_sdk import Server, Asset
+    from stellar_sdk.client.requests_client import RequestsClient
+    from stellar_sdk.exceptions import BaseHorizonError
+    from stellar_sdk.exceptions import ConnectionError as SdkConnectionError
+    import requests
+    from requests.adapters import HTTPAdapter
     STELLAR_SDK_AVAILABLE = True
 except ImportError:
     STELLAR_SDK_AVAILABLE = False
     print("Warning: stellar-sdk not installed. Install with: pip install stellar-sdk")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+    CISO8601_AVAILABLE = True
+except ImportError:
+    CISO8601_AVAILABLE = False
+    
+    def _parse_iso(value: str) -> datetime:
+        """Parse a Horizon timestamp such as 2024-01-31T12:00:00Z"""
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
 from config import Config as OGCConfig
-from formatters import format_transparency_report, format_json_report, format_stellar_amount
+from formatters import iter_transparency_report, format_json_report, format_stellar_amount
+from impact_policy import STROOPS_PER_UNIT, stroops_text, to_stroops
+
+logger = logging.getLogger(__name__)
+
+HORIZON_ATTEMPTS = 5
+HORIZON_MAX_BACKOFF = 30
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Connection pool sizing for the reporter's Horizon session
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 64
+
+# Largest page Horizon serves for collection endpoints
+PAGE_SIZE = 200
+
+# Userspace buffer for report writes
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Horizon's created_at format; same-format UTC strings sort chronologically
+HORIZON_TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# Payments above this many stroops (1000 OGC) are listed individually, largest first
+LARGE_TRANSACTION_THRESHOLD = 1000 * STROOPS_PER_UNIT
+LARGE_TRANSACTION_LIMIT = 20
+
+# Horizon response cache: entry count, total records held across all cached
+# pages, and per-endpoint freshness in seconds. Paged sweeps cache only their
+# first page; see _iter_window.
+CACHE_MAXSIZE = 1024
+CACHE_MAX_RECORDS = 5000
+SUPPLY_TTL = 60.0
+TRANSACTIONS_TTL = 10.0
+
+T = TypeVar('T')
+
+def _response_size(response: Dict[str, Any]) -> int:
+    """Records held by a Horizon response; a single resource counts as one"""
+    return len(response.get('_embedded', {}).get('records', ())) or 1
+
+def _is_transient(error: BaseException) -> bool:
+    """True for Horizon failures worth retrying: dropped connections, 429 and 5xx"""
+    if isinstance(error, SdkConnectionError):
+        return True
+    return isinstance(error, BaseHorizonError) and error.status in RETRYABLE_STATUSES
+
+def _call_with_retry(request: Callable[[], T]) -> T:
+    """Run a Horizon request, retrying transient failures with exponential backoff
+    
+    Waits min(30, 2**attempt) seconds plus up to a second of jitter between
+    attempts.
+    """
+    for attempt in range(HORIZON_ATTEMPTS):
+        try:
+            return request()
+        except Exception as e:
+            if attempt == HORIZON_ATTEMPTS - 1 or not _is_transient(e):
+                raise
+            time.sleep(min(HORIZON_MAX_BACKOFF, 2 ** attempt) + random.random())
+
+def _time_key(value: str) -> str:
+    """Chronologically sortable key for a Horizon created_at string
+    
+    Horizon timestamps are already in HORIZON_TIME_FORMAT and are returned
+    as-is; anything else is parsed and normalized to UTC.
+    """
+    if len(value) == 20 and value[-1] == 'Z':
+        return value
+    return _parse_iso(value).astimezone(timezone.utc).strftime(HORIZON_TIME_FORMAT)
+
+def _window_bound(moment: Optional[datetime], round_up: bool = False) -> Optional[str]:
+    """Format a time-range bound for string comparison with _time_key values
+    
+    Horizon timestamps have whole-second precision, so a start bound with a
+    fractional second is rounded up to keep the comparison exact.
+    """
+    if moment is None:
+        return None
+    moment = moment.astimezone(timezone.utc)
+    if round_up and moment.microsecond:
+        moment = moment.replace(microsecond=0) + timedelta(seconds=1)
+    return moment.strftime(HORIZON_TIME_FORMAT)
+
+def _decimal_default(obj: Any) -> str:
+    """orjson fallback serializer for the Decimal values in report data"""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+def _report_json_bytes(report_data: Dict[str, Any]) -> bytes:
+    """Serialize a report as indented UTF-8 JSON, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(report_data, default=_decimal_default, option=orjson.OPT_INDENT_2)
+    return format_json_report(report_data).encode('utf-8')
+
+def _write_atomic(path: Path, chunks: Iterable[bytes]) -> None:
+    """Write a file via a temporary sibling and os.replace
+    
+    Readers see either the previous file or the complete new one, never a
+    partially written report.
+    """
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        with open(tmp_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.writelines(chunks)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 class TransparencyReporter:
     """Generate transparency reports for OGC token"""
@@ -35,11 +170,75 @@ class TransparencyReporter:
             raise ImportError("stellar-sdk is required. Install with: pip install stellar-sdk")
         
         self.config = config
-        self.server = Server(config.get_horizon_url())
         
-        # Setup logging
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(__name__)
+        # One pooled keep-alive session so every Horizon call reuses TCP+TLS
+        # connections. Retries are handled by _call_with_retry, not urllib3.
+        self._http = requests.Session()
+        self._http.mount('https://', HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=0
+        ))
+        self.server = Server(config.get_horizon_url(), client=RequestsClient(session=self._http))
+        
+        # (endpoint, params) -> (expires_at monotonic timestamp, response, records)
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_records = 0
+        self._cache_lock = threading.Lock()
+        
+        self.logger = logger
+    
+    def _cached_call(self, call_builder, ttl: float) -> Dict[str, Any]:
+        """Run a Horizon GET through the instance's LRU cache
+        
+        The cache is bounded by CACHE_MAXSIZE entries and CACHE_MAX_RECORDS
+        records. Responses are shared with later callers, so treat the
+        returned object as read-only; copy it before changing anything.
+        
+        Args:
+            call_builder: stellar_sdk call builder, fully configured
+            ttl: Seconds the response stays fresh
+            
+        Returns:
+            Horizon response
+        """
+        key = (call_builder.endpoint, tuple(sorted(call_builder.params.items())))
+        now = time.monotonic()
+        
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                expires_at, response, _ = entry
+                if now < expires_at:
+                    self._cache.move_to_end(key)
+                    return response
+        
+        response = _call_with_retry(call_builder.call)
+        size = _response_size(response)
+        with self._cache_lock:
+            stale = self._cache.pop(key, None)
+            if stale is not None:
+                self._cache_records -= stale[2]
+            self._cache[key] = (now + ttl, response, size)
+            self._cache_records += size
+            while len(self._cache) > 1 and (len(self._cache) > CACHE_MAXSIZE or
+                                            self._cache_records > CACHE_MAX_RECORDS):
+                _, (_, _, evicted) = self._cache.popitem(last=False)
+                self._cache_records -= evicted
+        return response
+    
+    def _ensure_output_dir(self, output_dir: str) -> Path:
+        """Return the report directory as a Path, creating it if missing
+        
+        Args:
+            output_dir: Directory to save reports
+            
+        Returns:
+            Path to the existing directory
+        """
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        return output_path
     
     def get_token_supply_info(self) -> Dict[str, Any]:
         """Get current token supply information
@@ -52,7 +251,7 @@ class TransparencyReporter:
             token_code = self.config.get('token_code', 'OGC')
             
             # Get issuer account info
-            issuer_account = self.server.accounts().account_id(issuer_address).call()
+            issuer_account = self._cached_call(self.server.accounts().account_id(issuer_address), SUPPLY_TTL)
             
             # Find OGC balance in issuer account (this represents unissued tokens)
             issuer_balance = Decimal('0')
@@ -87,6 +286,65 @@ class TransparencyReporter:
                 'issuer_address': self.config.get('issuer_address', 'Unknown')
             }
     
+    def _iter_window(self, make_call: Callable[[], Any], page_size: int,
+                     start_time: Optional[datetime] = None,
+                     end_time: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Yield records of a newest-first Horizon collection inside a time range
+        
+        Pages are fetched lazily and followed by paging_token cursor, so only
+        the pages needed to reach start_time are downloaded and the sweep
+        holds one page at a time. Only the first (newest) page goes through
+        the response cache; older pages are fetched directly and dropped once
+        consumed, so a long sweep does not fill the cache.
+        
+        Args:
+            make_call: Returns a fresh call builder for the collection, ordered desc
+            page_size: Limit set on the call builder
+            start_time: Stop once records are older than this
+            end_time: Skip records newer than this
+            
+        Yields:
+            Horizon records, newest first
+        """
+        # Compare timestamps as strings; no datetime is built per record
+        start_key = _window_bound(start_time, round_up=True)
+        end_key = _window_bound(end_time)
+        
+        response = self._cached_call(make_call(), TRANSACTIONS_TTL)
+        while True:
+            records = response.get('_embedded', {}).get('records', [])
+            
+            for record in records:
+                record_time = _time_key(record['created_at'])
+                if start_key and record_time < start_key:
+                    return
+                if end_key and record_time > end_key:
+                    continue
+                yield record
+            
+            # A short page is the last one
+            if len(records) < page_size:
+                return
+            
+            response = _call_with_retry(make_call().cursor(records[-1]['paging_token']).call)
+    
+    def iter_operations(self, account_id: str, start_time: Optional[datetime] = None,
+                        end_time: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Yield an account's operations inside a time range, newest first
+        
+        Args:
+            account_id: Account public key
+            start_time: Start of time range
+            end_time: End of time range
+            
+        Returns:
+            Lazy iterator of operation records
+        """
+        return self._iter_window(
+            lambda: self.server.operations().for_account(account_id).limit(PAGE_SIZE).order(desc=True),
+            PAGE_SIZE, start_time, end_time
+        )
+    
     def get_account_transactions(self, account_id: str, limit: int = 200, 
                                start_time: Optional[datetime] = None,
                                end_time: Optional[datetime] = None) -> List[Dict[str, Any]]:
@@ -94,35 +352,20 @@ class TransparencyReporter:
         
         Args:
             account_id: Account public key
-            limit: Maximum transactions to fetch
+            limit: Maximum transactions to return; pages are fetched until it is reached
             start_time: Start of time range
             end_time: End of time range
             
         Returns:
-            List of transactions
+            List of transactions, newest first
         """
         try:
-            # Build query
-            transactions_call = self.server.transactions().for_account(account_id).limit(limit).order(desc=True)
-            
-            all_transactions = []
-            
-            # Fetch transactions
-            response = transactions_call.call()
-            transactions = response.get('_embedded', {}).get('records', [])
-            
-            for tx in transactions:
-                tx_time = datetime.fromisoformat(tx['created_at'].replace('Z', '+00:00'))
-                
-                # Filter by time range if provided
-                if start_time and tx_time < start_time:
-                    continue
-                if end_time and tx_time > end_time:
-                    break
-                
-                all_transactions.append(tx)
-            
-            return all_transactions
+            page_size = min(limit, PAGE_SIZE)
+            transactions = self._iter_window(
+                lambda: self.server.transactions().for_account(account_id).limit(page_size).order(desc=True),
+                page_size, start_time, end_time
+            )
+            return list(islice(transactions, limit))
             
         except Exception as e:
             self.logger.error(f"Error fetching transactions for {account_id}: {e}")
@@ -142,62 +385,78 @@ class TransparencyReporter:
             token_code = self.config.get('token_code', 'OGC')
             issuer_address = self.config.get('issuer_address')
             
-            # Get issuer transactions (most token activity flows through here)
-            issuer_transactions = self.get_account_transactions(
-                issuer_address, limit=1000, start_time=start_time, end_time=end_time
-            )
+            # Stream the issuer's operations (most token activity flows through
+            # here). Each payment record already carries its transaction hash,
+            # time, parties and amount, so no per-transaction lookup is needed.
+            operations = self.iter_operations(issuer_address, start_time, end_time)
             
             # Analyze transactions
+            transaction_hashes = set()
             payment_count = 0
-            total_volume = Decimal('0')
-            large_transactions = []
-            transaction_sizes = []
-            
-            for tx in issuer_transactions:
-                # Get operations for this transaction
-                try:
-                    ops_response = self.server.operations().for_transaction(tx['hash']).call()
-                    operations = ops_response.get('_embedded', {}).get('records', [])
-                    
-                    for op in operations:
-                        # Look for payment operations involving OGC
-                        if op.get('type') == 'payment':
-                            asset_code = op.get('asset_code')
-                            asset_issuer = op.get('asset_issuer')
-                            
-                            if asset_code == token_code and asset_issuer == issuer_address:
-                                payment_count += 1
-                                amount = Decimal(op.get('amount', '0'))
-                                total_volume += amount
-                                transaction_sizes.append(amount)
-                                
-                                # Track large transactions (>1000 OGC)
-                                if amount > 1000:
-                                    large_transactions.append({
-                                        'hash': tx['hash'],
-                                        'created_at': tx['created_at'],
-                                        'from': op.get('from'),
-                                        'to': op.get('to'),
-                                        'amount': str(amount)
-                                    })
-                    
-                except Exception as e:
-                    self.logger.warning(f"Error analyzing transaction {tx['hash']}: {e}")
+            # Amounts are accumulated as integer stroops and formatted once at the end
+            total_volume = 0
+            min_transaction = None
+            max_transaction = None
+            # Min-heap of (amount, sequence, row) holding the largest payments seen
+            large_heap = []
+            
+            # Bound once outside the per-operation loop
+            add_hash = transaction_hashes.add
+            heappush = heapq.heappush
+            heappushpop = heapq.heappushpop
+            
+            for op in operations:
+                get = op.get
+                
+                # Operations of failed transactions moved no tokens. Horizon
+                # omits them unless include_failed is set; this keeps the
+                # counts right if it ever is.
+                if get('transaction_successful') is False:
+                    continue
+                
+                add_hash(op['transaction_hash'])
+                
+                # Only OGC payment operations count towards volume
+                if (get('type') != 'payment' or get('asset_code') != token_code
+                        or get('asset_issuer') != issuer_address):
                     continue
+                
+                payment_count += 1
+                amount = to_stroops(get('amount', '0'))
+                total_volume += amount
+                if min_transaction is None or amount < min_transaction:
+                    min_transaction = amount
+                if max_transaction is None or amount > max_transaction:
+                    max_transaction = amount
+                
+                # Track large transactions (>1000 OGC)
+                if amount > LARGE_TRANSACTION_THRESHOLD:
+                    entry = (amount, payment_count, {
+                        'hash': op['transaction_hash'],
+                        'created_at': op['created_at'],
+                        'from': get('from'),
+                        'to': get('to'),
+                        'amount': stroops_text(amount)
+                    })
+                    if len(large_heap) < LARGE_TRANSACTION_LIMIT:
+                        heappush(large_heap, entry)
+                    else:
+                        heappushpop(large_heap, entry)
             
             # Calculate statistics
-            avg_transaction_size = total_volume / payment_count if payment_count > 0 else Decimal('0')
+            large_transactions = [row for _, _, row in sorted(large_heap, reverse=True)]
+            avg_transaction_size = total_volume // payment_count if payment_count > 0 else 0
             
             return {
                 'period_start': start_time.isoformat(),
                 'period_end': end_time.isoformat(),
-                'transaction_count': len(issuer_transactions),
+                'transaction_count': len(transaction_hashes),
                 'payment_count': payment_count,
-                'total_volume': str(total_volume),
-                'avg_transaction_size': str(avg_transaction_size),
-                'large_transactions': large_transactions[:20],  # Top 20
-                'max_transaction': str(max(transaction_sizes)) if transaction_sizes else '0',
-                'min_transaction': str(min(transaction_sizes)) if transaction_sizes else '0'
+                'total_volume': stroops_text(total_volume),
+                'avg_transaction_size': stroops_text(avg_transaction_size),
+                'large_transactions': large_transactions,  # Top 20 by amount
+                'max_transaction': stroops_text(max_transaction) if max_transaction is not None else '0',
+                'min_transaction': stroops_text(min_transaction) if min_transaction is not None else '0'
             }
             
         except Exception as e:
@@ -291,8 +550,7 @@ class TransparencyReporter:
             }
             
             # Create output directory
-            output_path = Path(output_dir)
-            output_path.mkdir(exist_ok=True)
+            output_path = self._ensure_output_dir(output_dir)
             
             # Generate file names
             date_str = f"{year}-{month:02d}"
@@ -300,13 +558,13 @@ class TransparencyReporter:
             html_file = output_path / f"ogc_transparency_{date_str}.html"
             
             # Save JSON report
-            with open(json_file, 'w', encoding='utf-8') as f:
-                f.write(format_json_report(report_data))
+            _write_atomic(json_file, [_report_json_bytes(report_data)])
             
-            # Generate and save HTML report
-            html_content = format_transparency_report(report_data)
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            # Stream the HTML report to disk section by section
+            _write_atomic(
+                html_file,
+                (chunk.encode('utf-8') for chunk in iter_transparency_report(report_data))
+            )
             
             self.logger.info(f"Reports saved:")
             self.logger.info(f"  JSON: {json_file}")
@@ -412,9 +670,11 @@ class TransparencyReporter:
             start_time = datetime(year, 1, 1, tzinfo=timezone.utc)
             end_time = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
             
-            # Get annual data
-            supply_info = self.get_token_supply_info()
-            annual_analysis = self.analyze_token_transactions(start_time, end_time)
+            # Get annual data; the supply lookup overlaps the operations sweep
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                supply_future = executor.submit(self.get_token_supply_info)
+                annual_analysis = self.analyze_token_transactions(start_time, end_time)
+                supply_info = supply_future.result()
             
             # Compile annual data
             annual_data = {
@@ -433,12 +693,10 @@ class TransparencyReporter:
             }
             
             # Save annual report
-            output_path = Path(output_dir)
-            output_path.mkdir(exist_ok=True)
+            output_path = self._ensure_output_dir(output_dir)
             
             json_file = output_path / f"ogc_annual_summary_{year}.json"
-            with open(json_file, 'w', encoding='utf-8') as f:
-                f.write(format_json_report(annual_data))
+            _write_atomic(json_file, [_report_json_bytes(annual_data)])
             
             self.logger.info(f"Annual summary saved: {json_file}")
             
@@ -518,6 +776,8 @@ if __name__ == "__main__":
     # Example usage
     import sys
     
+    logging.basicConfig(level=logging.INFO)
+    
     if len(sys.argv) < 2:
         print("Usage:")
         print("  python transparency_reporter.py stats")
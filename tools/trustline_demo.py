@@ -4,9 +4,22 @@ Trustline Establishment Demo
 Shows how the trustline process works without real secret keys
 """
 
+from itertools import islice
+from typing import Optional
+
 from stellar_sdk import Keypair, Asset
 from config import Config
 
+# Sample keypair shown by the demo, generated once per process
+_DEMO_KEYPAIR: Optional[Keypair] = None
+
+def _demo_keypair() -> Keypair:
+    """Return the process-wide demo keypair, generating it on first use."""
+    global _DEMO_KEYPAIR
+    if _DEMO_KEYPAIR is None:
+        _DEMO_KEYPAIR = Keypair.random()
+    return _DEMO_KEYPAIR
+
 def demo_trustline_establishment():
     """Demonstrate the trustline establishment process."""
     print("🔗 TRUSTLINE ESTABLISHMENT DEMO")
@@ -15,7 +28,7 @@ def demo_trustline_establishment():
     config = Config()
     
     # Generate a sample keypair for demonstration
-    sample_keypair = Keypair.random()
+    sample_keypair = _demo_keypair()
     
     print(f"🌍 Network: {config.STELLAR_NETWORK.upper()}")
     print(f"🪙 Token: {config.TOKEN_CODE}")
@@ -68,13 +81,13 @@ def show_current_trustline_status():
     
     print(f"\n❌ Accounts without trustlines (from our recipient list):")
     try:
+        # Read lazily: only the first 5 non-blank lines are ever loaded
         with open('airdrop_recipients.txt', 'r') as f:
-            recipients = [line.strip() for line in f if line.strip()]
-        
-        for i, recipient in enumerate(recipients[:5], 1):  # Show first 5
-            if recipient != known_trustline_account:
-                print(f"   {i}. {recipient}")
-                print(f"      Status: Valid account, needs trustline")
+            recipients = filter(None, (line.strip() for line in f))
+            for i, recipient in enumerate(islice(recipients, 5), 1):  # Show first 5
+                if recipient != known_trustline_account:
+                    print(f"   {i}. {recipient}")
+                    print(f"      Status: Valid account, needs trustline")
     except:
         print("   (No recipient list found)")
     
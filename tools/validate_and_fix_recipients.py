@@ -4,54 +4,270 @@ Account validator and replacer for airdrop distribution
 Checks accounts and replaces bad ones automatically
 """
 
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from stellar_sdk import Server
-from config import Config
+from stellar_sdk.client.requests_client import RequestsClient
+from validators import validate_stellar_address
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+HORIZON_URL = "https://horizon.stellar.org"
+
+# Upper bound on Horizon account lookups in flight at once
+MAX_CONCURRENT_CHECKS = 64
+
+REQUEST_TIMEOUT = 10
+
+# Attempts per Horizon request on 429/5xx, with exponential backoff between them
+HORIZON_ATTEMPTS = 5
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+VALID_REASON = "Account exists and is active"
+NOT_FOUND_REASON = "Account not found or inactive"
+
+# On-disk cache of definitive Horizon answers (exists / 404) between runs,
+# kept next to this script rather than in the cwd. Errors and timeouts are
+# never cached.
+CACHE_FILE = Path(__file__).resolve().parent / ".horizon_validation_cache.json"
+POSITIVE_TTL = 24 * 60 * 60
+NEGATIVE_TTL = 60 * 60
+
+# One keep-alive session shared by every blocking Horizon call in this script;
+# urllib3 retries rate limits and server errors, honoring Retry-After
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=HORIZON_ATTEMPTS,
+        backoff_factor=0.5,
+        status_forcelist=RETRYABLE_STATUSES,
+        respect_retry_after_header=True,
+    ),
+))
+_HORIZON = Server(HORIZON_URL, client=RequestsClient(session=_SESSION))
 
 def check_account_validity(account_id):
     """Check if a Stellar account exists and is active."""
     try:
-        server = Server("https://horizon.stellar.org")
-        account = server.load_account(account_id)
-        return True, "Account exists and is active"
+        _HORIZON.load_account(account_id)
+        return True, VALID_REASON
     except Exception as e:
         error_msg = str(e)
         if "404" in error_msg or "not found" in error_msg.lower():
-            return False, "Account not found or inactive"
+            return False, NOT_FOUND_REASON
         else:
             return False, f"Error checking account: {error_msg}"
 
-def find_replacement_accounts(count=5):
-    """Find replacement accounts from recent transactions."""
+def _header_seconds(headers, name, default):
+    """Read a header holding a number of seconds, falling back to default."""
     try:
-        url = "https://horizon.stellar.org/transactions"
-        params = {
-            'limit': count * 5,  # Get more to filter
-            'order': 'desc'
-        }
+        return max(0.0, float(headers[name]))
+    except (KeyError, ValueError):
+        return default
+
+class HorizonLimiter:
+    """Caps concurrent async Horizon requests and pauses all of them when
+    Horizon reports the rate limit window is used up.
+    
+    Use as `async with limiter:` around each request, then pass the response
+    headers to observe().
+    """
+    
+    def __init__(self, max_concurrent=MAX_CONCURRENT_CHECKS):
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._open = asyncio.Event()
+        self._open.set()
+        self._resume = None
+        self._resume_at = 0.0
+    
+    async def __aenter__(self):
+        await self._slots.acquire()
+        try:
+            await self._open.wait()
+        except BaseException:
+            self._slots.release()
+            raise
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self._slots.release()
+    
+    def pause(self, seconds):
+        """Hold back new requests for at least `seconds` from now."""
+        loop = asyncio.get_running_loop()
+        resume_at = loop.time() + seconds
+        if resume_at <= self._resume_at:
+            return
+        if self._resume is not None:
+            self._resume.cancel()
+        self._resume_at = resume_at
+        self._open.clear()
+        self._resume = loop.call_at(resume_at, self._open.set)
+    
+    def observe(self, headers):
+        """Pause until the window resets once Horizon says none are left."""
+        if headers.get("X-Ratelimit-Remaining") == "0":
+            self.pause(_header_seconds(headers, "X-Ratelimit-Reset", 1.0))
+
+async def check_account_validity_async(session, limiter, account_id):
+    """Async version of check_account_validity using a shared aiohttp session."""
+    url = f"{HORIZON_URL}/accounts/{account_id}"
+    error = None
+    for attempt in range(HORIZON_ATTEMPTS):
+        try:
+            async with limiter:
+                async with session.get(url) as response:
+                    status = response.status
+                    limiter.observe(response.headers)
+                    retry_after = _header_seconds(response.headers, "Retry-After", 1.0)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error = str(e) or type(e).__name__
+            await asyncio.sleep(0.5 * 2 ** attempt)
+            continue
         
-        response = requests.get(url, params=params)
+        if status == 200:
+            return True, VALID_REASON
+        if status == 404:
+            return False, NOT_FOUND_REASON
+        error = f"HTTP {status}"
+        if status not in RETRYABLE_STATUSES:
+            break
+        if status == 429:
+            # Rate limited: every request waits, not just this one
+            limiter.pause(retry_after * 2 ** attempt)
+        else:
+            await asyncio.sleep(0.5 * 2 ** attempt)
+    return False, f"Error checking account: {error}"
+
+async def check_accounts_async(account_ids):
+    """Check all accounts concurrently over one connection pool."""
+    limiter = HorizonLimiter()
+    connector = aiohttp.TCPConnector(limit_per_host=MAX_CONCURRENT_CHECKS)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        return await asyncio.gather(
+            *[check_account_validity_async(session, limiter, account_id) for account_id in account_ids]
+        )
+
+def load_validation_cache(path=CACHE_FILE):
+    """Load cached verdicts: account_id -> {"v": is_valid, "r": reason, "t": checked_at}."""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def save_validation_cache(cache, path=CACHE_FILE):
+    """Write the cache via a temporary file so a crash never leaves it truncated."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+def backup_file(path, backup_path):
+    """Keep the current contents of path at backup_path.
+    
+    Hard-links when the filesystem allows it, so nothing is copied and the
+    backup survives path being replaced; falls back to a copy otherwise.
+    """
+    try:
+        os.remove(backup_path)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(path, backup_path)
+    except OSError:
+        shutil.copy2(path, backup_path)
+
+def check_accounts(account_ids, use_cache=True):
+    """Check many accounts; returns (is_valid, reason) pairs in input order.
+    
+    Fresh cached verdicts are reused unless use_cache is False. New
+    definitive answers are always written back to the cache.
+    """
+    cache = load_validation_cache()
+    now = time.time()
+    
+    results = {}
+    to_check = []
+    for account_id in account_ids:
+        entry = cache.get(account_id) if use_cache else None
+        if entry and now - entry["t"] < (POSITIVE_TTL if entry["v"] else NEGATIVE_TTL):
+            results[account_id] = (entry["v"], entry["r"])
+        else:
+            to_check.append(account_id)
+    
+    if to_check:
+        if AIOHTTP_AVAILABLE:
+            fresh = asyncio.run(check_accounts_async(to_check))
+        else:
+            fresh = [check_account_validity(account_id) for account_id in to_check]
+        
+        for account_id, (is_valid, reason) in zip(to_check, fresh):
+            results[account_id] = (is_valid, reason)
+            if is_valid or reason == NOT_FOUND_REASON:
+                cache[account_id] = {"v": is_valid, "r": reason, "t": now}
+        save_validation_cache(cache)
+    
+    return [results[account_id] for account_id in account_ids]
+
+def _iter_tx_source_accounts(session, page_size=50, max_pages=20):
+    """Yield source accounts of recent transactions, newest first.
+    
+    Pages are fetched lazily by following Horizon's HAL next link, so a
+    caller that stops early never downloads the rest.
+    """
+    url = f"{HORIZON_URL}/transactions"
+    params = {'limit': page_size, 'order': 'desc'}
+    for _ in range(max_pages):
+        response = session.get(url, params=params, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         data = response.json()
         
-        replacement_accounts = set()
+        records = data.get('_embedded', {}).get('records', [])
+        for tx in records:
+            source_account = tx.get('source_account')
+            if source_account:
+                yield source_account
         
-        if '_embedded' in data and 'records' in data['_embedded']:
-            for tx in data['_embedded']['records']:
-                source_account = tx.get('source_account')
-                if source_account and source_account.startswith('G'):
-                    replacement_accounts.add(source_account)
-                
+        next_link = data.get('_links', {}).get('next', {}).get('href')
+        if len(records) < page_size or not next_link:
+            return
+        # The next link already carries limit, order and cursor
+        url, params = next_link, None
+
+def find_replacement_accounts(count=5):
+    """Find replacement accounts from recent transactions."""
+    try:
+        replacement_accounts = {}
+        for source_account in _iter_tx_source_accounts(_SESSION):
+            if source_account.startswith('G'):
+                replacement_accounts[source_account] = None
                 if len(replacement_accounts) >= count:
                     break
         
-        return list(replacement_accounts)[:count]
+        return list(replacement_accounts)
         
     except Exception as e:
         print(f"❌ Error finding replacement accounts: {e}")
         return []
 
-def validate_and_fix_recipients(filename="airdrop_recipients.txt"):
+def validate_and_fix_recipients(filename="airdrop_recipients.txt", use_cache=True):
     """Validate all recipients and replace bad ones."""
     print(f"🔍 VALIDATING RECIPIENTS IN {filename}")
     print("=" * 50)
@@ -69,12 +285,15 @@ def validate_and_fix_recipients(filename="airdrop_recipients.txt"):
     valid_recipients = []
     bad_recipients = []
     
-    # Check each account
+    # Malformed addresses are rejected offline; only distinct well-formed ones
+    # are looked up on Horizon, concurrently, then reported in file order
+    well_formed = list(dict.fromkeys(r for r in recipients if validate_stellar_address(r)))
+    checked = dict(zip(well_formed, check_accounts(well_formed, use_cache)))
+    
     for i, recipient in enumerate(recipients, 1):
+        is_valid, reason = checked.get(recipient, (False, "Invalid address format"))
         print(f"[{i:2d}/{len(recipients)}] Checking {recipient[:8]}...", end=" ")
         
-        is_valid, reason = check_account_validity(recipient)
-        
         if is_valid:
             print("✅")
             valid_recipients.append(recipient)
@@ -102,12 +321,6 @@ def validate_and_fix_recipients(filename="airdrop_recipients.txt"):
             replacements = find_replacement_accounts(len(bad_recipients) + 2)  # Get a few extra
             
             if len(replacements) >= len(bad_recipients):
-                # Backup original file
-                import shutil
-                backup_filename = f"{filename}.backup"
-                shutil.copy(filename, backup_filename)
-                print(f"📁 Backed up original to {backup_filename}")
-                
                 # Create new recipients list
                 final_recipients = valid_recipients.copy()
                 
@@ -117,10 +330,16 @@ def validate_and_fix_recipients(filename="airdrop_recipients.txt"):
                     print(f"   ❌ {bad['account'][:8]}... → ✅ {replacement[:8]}...")
                     final_recipients.append(replacement)
                 
-                # Write updated file
-                with open(filename, 'w') as f:
-                    for recipient in final_recipients:
-                        f.write(f"{recipient}\n")
+                # Write the updated list in one go, keep the original as the
+                # backup, then swap the new file into place
+                tmp_filename = f"{filename}.tmp"
+                with open(tmp_filename, 'wb') as f:
+                    f.write("\n".join(final_recipients).encode() + b"\n")
+                
+                backup_filename = f"{filename}.backup"
+                backup_file(filename, backup_filename)
+                os.replace(tmp_filename, filename)
+                print(f"📁 Backed up original to {backup_filename}")
                 
                 print(f"\n✅ SUCCESS! Updated {filename}")
                 print(f"   📊 Total recipients: {len(final_recipients)}")
@@ -137,4 +356,9 @@ def validate_and_fix_recipients(filename="airdrop_recipients.txt"):
     return len(bad_recipients) == 0
 
 if __name__ == "__main__":
-    validate_and_fix_recipients()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Validate airdrop recipients and replace bad ones")
+    parser.add_argument("filename", nargs="?", default="airdrop_recipients.txt", help="Recipients file, one address per line")
+    parser.add_argument("--no-cache", action="store_true", help=f"Ignore cached results in {CACHE_FILE} and recheck every account")
+    args = parser.parse_args()
+    
+    validate_and_fix_recipients(args.filename, use_cache=not args.no_cache)
\ No newline at end of file
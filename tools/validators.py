@@ -3,10 +3,61 @@ Input validation utilities for OGCoin Stellar tools
 Validates addresses, amounts, and other inputs for security
 """
 
+import itertools
+import os
 import re
-from typing import Optional, List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Iterable, Iterator
 from decimal import Decimal, InvalidOperation
 
+# Optional: StrKey adds the CRC16 checksum check on top of the format check
+try:
+    from stellar_sdk import StrKey
+    STELLAR_SDK_AVAILABLE = True
+except ImportError:
+    STELLAR_SDK_AVAILABLE = False
+
+# Optional: pyarrow parses bulk payment CSVs in C, in bounded blocks
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Compiled once at import; these run on every send_payment
+_G_RE = re.compile(r'G[A-Z2-7]{55}')
+_S_RE = re.compile(r'S[A-Z2-7]{55}')
+_AMOUNT_RE = re.compile(r'(?=\.?\d)\d{0,13}(\.\d{0,7})?')
+MAX_AMOUNT = Decimal('922337203685.4775807')
+MAX_WHOLE_AMOUNT = 922_337_203_685
+MIN_AMOUNT = Decimal('0.0000001')
+
+# Characters sanitize_memo strips. ASCII memos take the str.translate path;
+# the table is derived from the same class so both paths agree
+_MEMO_STRIP_RE = re.compile(r'[^\w\s\-\.\_\@\#]')
+_MEMO_DELETE = str.maketrans('', '', ''.join(
+    c for c in map(chr, range(128)) if _MEMO_STRIP_RE.match(c)
+))
+
+# Delimiters accepted in bulk payment CSVs, in order of preference on ties
+CSV_DELIMITERS = (',', ';', '\t', '|')
+
+# Files with at least this many rows are validated across worker processes,
+# fed ROW_BATCH_SIZE rows at a time so memory stays bounded
+PARALLEL_MIN_ROWS = 10_000
+ROW_BATCH_SIZE = 64 * 1024
+ROW_CHUNKSIZE = 1024
+
+# Bytes pyarrow parses per block when reading bulk payment CSVs
+CSV_BLOCK_SIZE = 8 << 20
+
+# Memoized address/amount verdicts; airdrop lists and bulk files repeat both.
+# Each entry pins its input string, so this is a few tens of MB at most
+VALIDATION_CACHE_SIZE = 100_000
+
 def validate_stellar_address(address: str) -> bool:
     """Validate Stellar account address format
     
@@ -18,14 +69,20 @@ def validate_stellar_address(address: str) -> bool:
     """
     if not address or not isinstance(address, str):
         return False
-    
-    # Stellar addresses start with G and are 56 characters
-    if not address.startswith('G') or len(address) != 56:
+    return _check_address(address)
+
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _check_address(address: str) -> bool:
+    """Format and checksum check behind validate_stellar_address"""
+    # Stellar addresses are G followed by 55 base32 characters; the cheap
+    # length/prefix checks reject most bad input before the regex runs
+    if len(address) != 56 or address[0] != 'G' or not _G_RE.fullmatch(address):
         return False
     
-    # Check if all characters are valid base32
-    valid_chars = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ234567'
-    return all(c in valid_chars for c in address)
+    # Verify the version byte and checksum when the SDK is available
+    if STELLAR_SDK_AVAILABLE:
+        return StrKey.is_valid_ed25519_public_key(address)
+    return True
 
 def validate_stellar_secret(secret: str) -> bool:
     """Validate Stellar secret key format
@@ -39,45 +96,48 @@ def validate_stellar_secret(secret: str) -> bool:
     if not secret or not isinstance(secret, str):
         return False
     
-    # Stellar secrets start with S and are 56 characters
-    if not secret.startswith('S') or len(secret) != 56:
+    # Stellar secrets are S followed by 55 base32 characters
+    if len(secret) != 56 or secret[0] != 'S' or not _S_RE.fullmatch(secret):
         return False
     
-    # Check if all characters are valid base32
-    valid_chars = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ234567'
-    return all(c in valid_chars for c in secret)
+    # Verify the version byte and checksum when the SDK is available
+    if STELLAR_SDK_AVAILABLE:
+        return StrKey.is_valid_ed25519_secret_seed(secret)
+    return True
 
-def validate_amount(amount: str) -> bool:
+def validate_amount(amount: str) -> Optional[Decimal]:
     """Validate amount format for Stellar transactions
     
     Args:
         amount: Amount string to validate
         
     Returns:
-        True if valid, False otherwise
+        The parsed amount if valid (always truthy), None otherwise
     """
     if not amount or not isinstance(amount, str):
-        return False
+        return None
+    return _parse_amount(amount)
+
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _parse_amount(amount: str) -> Optional[Decimal]:
+    """Format and range check behind validate_amount"""
+    # Plain decimal with at most 7 decimal places (Stellar precision), either
+    # side of the point may be empty ('.5', '5.') but not both; rejects signs,
+    # exponents and whitespace before building a Decimal
+    if not _AMOUNT_RE.fullmatch(amount):
+        return None
+    
+    # Whole amounts (nearly every airdrop amount) are range-checked as ints
+    if '.' not in amount:
+        return Decimal(amount) if 0 < int(amount) <= MAX_WHOLE_AMOUNT else None
     
     try:
         decimal_amount = Decimal(amount)
-        
-        # Must be positive
-        if decimal_amount <= 0:
-            return False
-        
-        # Must have at most 7 decimal places (Stellar precision)
-        if decimal_amount.as_tuple().exponent < -7:
-            return False
-        
-        # Must not be too large (prevent overflow)
-        if decimal_amount > Decimal('922337203685.4775807'):
-            return False
-        
-        return True
-        
     except (InvalidOperation, ValueError):
-        return False
+        return None
+    
+    # Must be positive and not too large (prevent overflow)
+    return decimal_amount if 0 < decimal_amount <= MAX_AMOUNT else None
 
 def validate_memo(memo: str, memo_type: str = 'text') -> bool:
     """Validate memo format
@@ -103,12 +163,40 @@ def validate_memo(memo: str, memo_type: str = 'text') -> bool:
         except ValueError:
             return False
     elif memo_type in ['hash', 'return']:
-        # Hash/return memo must be 32 bytes hex
-        return len(memo) == 64 and all(c in '0123456789abcdefABCDEF' for c in memo)
+        # Hash/return memo must be 32 bytes hex; fromhex skips whitespace,
+        # so the decoded length check rejects padded input
+        try:
+            return len(memo) == 64 and len(bytes.fromhex(memo)) == 32
+        except ValueError:
+            return False
     
     return False
 
-def validate_csv_row(row: Dict[str, str]) -> Dict[str, Any]:
+@dataclass(slots=True)
+class RowResult:
+    """Validation outcome for one bulk payment row
+    
+    The error and warning lists are only created when something is added,
+    so the common all-valid row allocates nothing beyond the result itself.
+    """
+    valid: bool = True
+    errors: Optional[List[str]] = None
+    warnings: Optional[List[str]] = None
+    
+    def add_error(self, message: str) -> None:
+        """Record an error and mark the row invalid"""
+        if self.errors is None:
+            self.errors = []
+        self.errors.append(message)
+        self.valid = False
+    
+    def add_warning(self, message: str) -> None:
+        """Record a warning; the row stays valid"""
+        if self.warnings is None:
+            self.warnings = []
+        self.warnings.append(message)
+
+def validate_csv_row(row: Dict[str, str]) -> RowResult:
     """Validate a CSV row for bulk payments
     
     Args:
@@ -117,42 +205,89 @@ def validate_csv_row(row: Dict[str, str]) -> Dict[str, Any]:
     Returns:
         Validation result with errors if any
     """
-    result = {
-        'valid': True,
-        'errors': [],
-        'warnings': []
-    }
+    result = RowResult()
     
     # Check required fields
-    if 'address' not in row or not row['address']:
-        result['valid'] = False
-        result['errors'].append("Missing address field")
-    elif not validate_stellar_address(row['address']):
-        result['valid'] = False
-        result['errors'].append(f"Invalid Stellar address: {row['address']}")
-    
-    if 'amount' not in row or not row['amount']:
-        result['valid'] = False
-        result['errors'].append("Missing amount field")
-    elif not validate_amount(row['amount']):
-        result['valid'] = False
-        result['errors'].append(f"Invalid amount: {row['amount']}")
+    address = row.get('address')
+    if not address:
+        result.add_error("Missing address field")
+    elif not validate_stellar_address(address):
+        result.add_error(f"Invalid Stellar address: {address}")
+    
+    if not row.get('amount'):
+        result.add_error("Missing amount field")
     else:
-        # Check for very small amounts
-        try:
-            if Decimal(row['amount']) < Decimal('0.0000001'):
-                result['warnings'].append(f"Very small amount: {row['amount']}")
-        except:
-            pass
+        amount = validate_amount(row['amount'])
+        if amount is None:
+            result.add_error(f"Invalid amount: {row['amount']}")
+        elif amount < MIN_AMOUNT:
+            # Check for very small amounts
+            result.add_warning(f"Very small amount: {row['amount']}")
     
     # Validate optional memo
-    if row.get('memo'):
-        if not validate_memo(row['memo']):
-            result['valid'] = False
-            result['errors'].append(f"Invalid memo: {row['memo']}")
+    memo = row.get('memo')
+    if memo and not validate_memo(memo):
+        result.add_error(f"Invalid memo: {memo}")
     
     return result
 
+def _validate_rows(rows: Iterable[Dict[str, str]]) -> Iterator[RowResult]:
+    """Yield validate_csv_row results in row order
+    
+    Small inputs (or single-CPU hosts) are validated inline; large ones are
+    spread over a process pool, since the checks are CPU-bound and
+    independent per row.
+    """
+    rows = iter(rows)
+    batch = list(itertools.islice(rows, PARALLEL_MIN_ROWS))
+    if len(batch) < PARALLEL_MIN_ROWS or (os.cpu_count() or 1) < 2:
+        yield from map(validate_csv_row, batch)
+        yield from map(validate_csv_row, rows)
+        return
+    
+    with ProcessPoolExecutor() as executor:
+        while batch:
+            yield from executor.map(validate_csv_row, batch, chunksize=ROW_CHUNKSIZE)
+            batch = list(itertools.islice(rows, ROW_BATCH_SIZE))
+
+def _iter_arrow_rows(file_path: str, fieldnames: List[str], delimiter: str) -> Iterator[Dict[str, str]]:
+    """Yield CSV rows as dicts, parsed block by block with pyarrow
+    
+    Every column is read as a string, as csv.DictReader would. A row with the
+    wrong number of fields raises pyarrow.ArrowInvalid.
+    """
+    reader = pacsv.open_csv(
+        file_path,
+        read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+        parse_options=pacsv.ParseOptions(delimiter=delimiter),
+        convert_options=pacsv.ConvertOptions(column_types={name: pa.string() for name in fieldnames}),
+    )
+    for batch in reader:
+        columns = [column.to_pylist() for column in batch.columns]
+        for values in zip(*columns):
+            yield dict(zip(fieldnames, values))
+
+def _tally_rows(result: Dict[str, Any], rows: Iterable[Dict[str, str]]) -> None:
+    """Validate rows and add their counts, errors and warnings to result"""
+    for row_num, row_validation in enumerate(_validate_rows(rows), start=2):  # Start at 2 (header is row 1)
+        result['total_rows'] += 1
+        
+        if row_validation.valid:
+            result['valid_rows'] += 1
+        else:
+            result['invalid_rows'] += 1
+            result['row_errors'].append({
+                'row': row_num,
+                'errors': row_validation.errors
+            })
+        
+        # Collect warnings
+        if row_validation.warnings:
+            result['warnings'].extend([
+                f"Row {row_num}: {warning}" 
+                for warning in row_validation.warnings
+            ])
+
 def validate_bulk_payment_file(file_path: str) -> Dict[str, Any]:
     """Validate bulk payment CSV file
     
@@ -163,7 +298,6 @@ def validate_bulk_payment_file(file_path: str) -> Dict[str, Any]:
         Validation summary
     """
     import csv
-    import os
     
     result = {
         'valid': True,
@@ -183,42 +317,35 @@ def validate_bulk_payment_file(file_path: str) -> Dict[str, Any]:
     
     try:
         with open(file_path, 'r', newline='', encoding='utf-8') as csvfile:
-            # Try to detect delimiter
-            sample = csvfile.read(1024)
-            csvfile.seek(0)
-            sniffer = csv.Sniffer()
-            delimiter = sniffer.sniff(sample).delimiter
-            
-            reader = csv.DictReader(csvfile, delimiter=delimiter)
+            # Pick the delimiter from the header line, then keep streaming
+            # the same file object from there (no sniffing)
+            header = csvfile.readline()
+            delimiter = max(CSV_DELIMITERS, key=header.count)
+            fieldnames = next(csv.reader([header], delimiter=delimiter), [])
             
             # Check required columns
             required_columns = ['address', 'amount']
-            missing_columns = [col for col in required_columns if col not in reader.fieldnames]
+            missing_columns = [col for col in required_columns if col not in fieldnames]
             if missing_columns:
                 result['valid'] = False
                 result['errors'].append(f"Missing required columns: {missing_columns}")
                 return result
             
             # Validate each row
-            for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
-                result['total_rows'] += 1
-                
-                row_validation = validate_csv_row(row)
-                if row_validation['valid']:
-                    result['valid_rows'] += 1
-                else:
-                    result['invalid_rows'] += 1
-                    result['row_errors'].append({
-                        'row': row_num,
-                        'errors': row_validation['errors']
-                    })
-                
-                # Collect warnings
-                if row_validation['warnings']:
-                    result['warnings'].extend([
-                        f"Row {row_num}: {warning}" 
-                        for warning in row_validation['warnings']
-                    ])
+            if PYARROW_AVAILABLE:
+                try:
+                    _tally_rows(result, _iter_arrow_rows(file_path, fieldnames, delimiter))
+                except pa.ArrowInvalid:
+                    # A ragged row: pyarrow cannot say which lines the rows around
+                    # it came from, so recount the whole file with csv, which can
+                    for key in ('total_rows', 'valid_rows', 'invalid_rows'):
+                        result[key] = 0
+                    result['warnings'].clear()
+                    result['row_errors'].clear()
+                    csvfile.seek(0)
+                    _tally_rows(result, csv.DictReader(csvfile, delimiter=delimiter))
+            else:
+                _tally_rows(result, csv.DictReader(itertools.chain([header], csvfile), delimiter=delimiter))
     
     except Exception as e:
         result['valid'] = False
@@ -268,16 +395,12 @@ def validate_token_config(token_code: str, issuer: str, total_supply: str) -> Di
         result['errors'].append("Invalid issuer address")
     
     # Validate total supply
-    if not validate_amount(total_supply):
+    supply = validate_amount(total_supply)
+    if supply is None:
         result['valid'] = False
         result['errors'].append("Invalid total supply amount")
-    else:
-        try:
-            supply = Decimal(total_supply)
-            if supply > Decimal('922337203685'):  # Practical limit
-                result['warnings'].append("Very large total supply")
-        except:
-            pass
+    elif supply > MAX_WHOLE_AMOUNT:  # Practical limit
+        result['warnings'].append("Very large total supply")
     
     return result
 
@@ -294,7 +417,10 @@ def sanitize_memo(memo: str) -> str:
         return ""
     
     # Remove potentially dangerous characters
-    sanitized = re.sub(r'[^\w\s\-\.\_\@\#]', '', memo)
+    if memo.isascii():
+        sanitized = memo.translate(_MEMO_DELETE)
+    else:
+        sanitized = _MEMO_STRIP_RE.sub('', memo)
     
     # Truncate to safe length (28 bytes max for text memo)
     if len(sanitized.encode('utf-8')) > 28:
@@ -351,11 +477,14 @@ def validate_addresses_batch(addresses: List[str]) -> Dict[str, List[str]]:
     valid = []
     invalid = []
     
+    # One pass, with the checks and appends bound outside the loop
+    check = validate_stellar_address
+    keep, reject = valid.append, invalid.append
     for address in addresses:
-        if validate_stellar_address(address):
-            valid.append(address)
+        if check(address):
+            keep(address)
         else:
-            invalid.append(address)
+            reject(address)
     
     return {'valid': valid, 'invalid': invalid}
 
@@ -371,10 +500,13 @@ def validate_amounts_batch(amounts: List[str]) -> Dict[str, List[str]]:
     valid = []
     invalid = []
     
+    # One pass, with the checks and appends bound outside the loop
+    check = validate_amount
+    keep, reject = valid.append, invalid.append
     for amount in amounts:
-        if validate_amount(amount):
-            valid.append(amount)
+        if check(amount):
+            keep(amount)
         else:
-            invalid.append(amount)
+            reject(amount)
     
     return {'valid': valid, 'invalid': invalid}
\ No newline at end of file